@@ -0,0 +1,173 @@
+"""Benchmarks for the algorithm modules
+
+Each case times one operation over a ladder of input sizes, records the
+peak memory it allocates, and fits the exponent k in time ~ size^k. Results
+are saved as JSON and can be compared against a stored baseline.
+"""
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+# Registered cases, by name
+CASES = {}
+
+# A timing is only reported once the loop has run for at least this long
+MIN_TIME = 0.05
+REPEAT = 3
+
+# Slowdowns beyond this fraction of the baseline count as regressions
+DEFAULT_THRESHOLD = 0.25
+
+
+class Case:
+    """A benchmark: setup(size) prepares the inputs for one size and
+    returns a function of no arguments which runs the operation"""
+
+    def __init__(self, name, setup, sizes, unit):
+        self.name = name
+        self.setup = setup
+        self.sizes = sizes
+        self.unit = unit
+
+    def __repr__(self):
+        return f"Case({self.name!r}, {self.unit}={self.sizes})"
+
+
+def case(name, sizes, unit="n"):
+    """Register the decorated setup function as a benchmark case"""
+
+    def register(setup):
+        CASES[name] = Case(name, setup, sizes, unit)
+        return setup
+
+    return register
+
+
+def measure(fn, min_time=MIN_TIME, repeat=REPEAT):
+    """Time fn, returning the best time per call over several runs of a
+    loop long enough to time reliably"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        if elapsed == 0:
+            number *= 10
+        else:
+            number *= max(2, min(10, math.ceil(min_time / elapsed)))
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def peak_memory(fn):
+    """Measure the peak memory, in bytes, allocated by one call of fn"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def fit_exponent(sizes, seconds):
+    """Fit k in seconds ~ C size^k by least squares on a log-log scale"""
+    points = [
+        (math.log(s), math.log(t)) for s, t in zip(sizes, seconds) if s > 0 and t > 0
+    ]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def run_case(case, sizes=None, min_time=MIN_TIME, memory=True):
+    """Run one case over its size ladder"""
+    sizes = sizes or case.sizes
+    seconds = []
+    peaks = []
+    for size in sizes:
+        fn = case.setup(size)
+        seconds.append(measure(fn, min_time))
+        if memory:
+            peaks.append(peak_memory(fn))
+    return {
+        "unit": case.unit,
+        "sizes": list(sizes),
+        "seconds": seconds,
+        "peak_bytes": peaks if memory else None,
+        "exponent": fit_exponent(sizes, seconds),
+    }
+
+
+def run(names=None, quick=False, memory=True, report=None):
+    """Run the cases with the given names (or all of them), returning the
+    results as a dictionary ready to be saved as JSON
+
+    Quick runs only use the smaller half of each ladder. If report is given,
+    it is called with each case's name and results as they finish.
+    """
+    from benchmarks import cases  # noqa: F401, registers the cases
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "cases": {},
+    }
+    for name, case in CASES.items():
+        if names and not any(n in name for n in names):
+            continue
+        sizes = case.sizes
+        if quick:
+            sizes = sizes[: max(2, (len(sizes) + 1) // 2)]
+        min_time = MIN_TIME / 5 if quick else MIN_TIME
+        results["cases"][name] = run_case(case, sizes, min_time, memory)
+        if report:
+            report(name, results["cases"][name])
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """List the regressions of results against a baseline: each size of
+    each case which is slower by more than the threshold, as tuples
+    (name, size, baseline seconds, new seconds)"""
+    regressions = []
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        base_seconds = dict(zip(base["sizes"], base["seconds"]))
+        for size, seconds in zip(result["sizes"], result["seconds"]):
+            old = base_seconds.get(size)
+            if old is not None and seconds > old * (1 + threshold):
+                regressions.append((name, size, old, seconds))
+    return regressions
+
+
+def save(results, path):
+    """Save results as JSON"""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    """Load results saved as JSON"""
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,53 @@
+"""Run the benchmarks: python -m benchmarks [options] [name filters...]"""
+import argparse
+import sys
+
+import benchmarks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("names", nargs="*", help="only run cases containing these")
+    parser.add_argument("--quick", action="store_true", help="only the smaller sizes")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=benchmarks.DEFAULT_THRESHOLD,
+        help="fractional slowdown counted as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    def report(name, result):
+        exponent = result["exponent"]
+        if exponent is None:
+            print(f"{name} ({result['unit']})")
+        else:
+            print(f"{name} ({result['unit']}, exponent {exponent:.2f})")
+        for i, (size, seconds) in enumerate(zip(result["sizes"], result["seconds"])):
+            line = f"  {size:>14}  {seconds * 1e3:12.4f} ms"
+            if result["peak_bytes"]:
+                line += f"  {result['peak_bytes'][i] / 2 ** 20:10.2f} MiB"
+            print(line)
+
+    results = benchmarks.run(args.names, args.quick, not args.no_memory, report)
+    if args.output:
+        benchmarks.save(results, args.output)
+    if args.baseline:
+        regressions = benchmarks.compare(
+            results, benchmarks.load(args.baseline), args.threshold
+        )
+        for name, size, old, new in regressions:
+            print(
+                f"REGRESSION {name} at {size}: "
+                f"{old * 1e3:.4f} ms -> {new * 1e3:.4f} ms"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
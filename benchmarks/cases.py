@@ -0,0 +1,339 @@
+"""The benchmark cases, one or more for each algorithm module
+
+Inputs are drawn from a generator seeded by the size, so every run times
+the same inputs, and functions cached by `memo` are called uncached.
+"""
+import os
+import random
+import tempfile
+
+from benchmarks import case
+
+import babystep_giantstep
+import characters
+import descent
+import discrete_log
+import elliptic
+import euclid
+import gaussian
+import group_algebra
+import group_algorithms
+import groups
+import hw04
+import jacobi
+import m
+import modcontext
+import multiplicative
+import order
+import ppts
+import prime
+import primecount
+import primestore
+import residues
+import rings
+import sqrtmod
+
+
+def _random_prime(rng, bits, residue=None, modulus=None):
+    """Find a random prime of the given size, optionally in a residue class"""
+    while True:
+        n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if modulus is not None:
+            n += (residue - n) % modulus
+        if n.bit_length() == bits and prime.rabin_miller(n, 20):
+            return n
+
+
+# prime
+
+
+@case("prime.eratosthenes", [10 ** 4, 3 * 10 ** 4, 10 ** 5, 3 * 10 ** 5, 10 ** 6])
+def _eratosthenes(n):
+    return lambda: prime.eratosthenes(n)
+
+
+@case("prime.rabin_miller", [64, 128, 256, 512, 1024], unit="bits")
+def _rabin_miller(bits):
+    p = _random_prime(random.Random(bits), bits)
+    return lambda: prime.rabin_miller(p, 20)
+
+
+@case("prime.prime_factor", [24, 32, 40, 48], unit="bits")
+def _prime_factor(bits):
+    rng = random.Random(bits)
+    n = _random_prime(rng, bits // 2) * _random_prime(rng, bits - bits // 2)
+    return lambda: prime.prime_factor.uncached(n)
+
+
+@case("primecount.prime_pi", [10 ** 7, 10 ** 8, 10 ** 9, 10 ** 10])
+def _prime_pi(x):
+    counter = primecount.PrimeCounter()
+    counter._ensure(x)
+
+    def run():
+        # Time the counting, but not building the base sieve
+        counter._phi_cache.clear()
+        return counter.pi(x)
+
+    return run
+
+
+# jacobi
+
+
+@case("jacobi.jacobi", [64, 256, 1024, 4096], unit="bits")
+def _jacobi(bits):
+    rng = random.Random(bits)
+    a = rng.getrandbits(bits)
+    b = rng.getrandbits(bits) | 1
+    return lambda: jacobi.jacobi(a, b)
+
+
+# euclid
+
+
+@case("euclid.extended_euclidean", [1000, 4000, 16000, 64000], unit="bits")
+def _extended_euclidean(bits):
+    rng = random.Random(bits)
+    a, b = rng.getrandbits(bits), rng.getrandbits(bits)
+    return lambda: euclid.extended_euclidean(a, b)
+
+
+# sqrtmod
+
+
+@case("sqrtmod.sqrt_mod_prime", [64, 256, 1024], unit="bits")
+def _sqrt_mod_prime(bits):
+    rng = random.Random(bits)
+    p = _random_prime(rng, bits, 1, 8)
+    a = pow(rng.randrange(2, p), 2, p)
+    return lambda: sqrtmod.sqrt_mod_prime(a, p)
+
+
+# discrete_log
+
+
+@case("discrete_log.discrete_log", [12, 16, 20, 24, 28], unit="bits")
+def _discrete_log(bits):
+    rng = random.Random(bits)
+    p = _random_prime(rng, bits)
+    g = discrete_log.find_generator(p)
+    a = pow(g, rng.randrange(1, p - 1), p)
+
+    def run():
+        # Time the setup of the index calculus solver as well
+        discrete_log._index_calculus_solvers.clear()
+        return discrete_log.discrete_log.uncached(g, p, a)
+
+    return run
+
+
+# elliptic
+
+
+@case("elliptic.count_solutions_mod_p", [10 ** 3, 10 ** 4, 10 ** 5], unit="p")
+def _count_solutions_mod_p(size):
+    p = prime.segmented_sieve(size, 2 * size)[0]
+    curve = elliptic.EllipticCurve(0, -1, 1)
+    return lambda: curve.count_solutions_mod_p.uncached(curve, p)
+
+
+@case("elliptic.search_points", [10 ** 3, 10 ** 4, 10 ** 5], unit="height")
+def _search_points(height):
+    curve = elliptic.EllipticCurve(0, -2, 5)
+    return lambda: curve.search_points(height)
+
+
+# group_algebra
+
+
+@case("group_algebra.GroupRing.__mul__", [8, 16, 32, 64], unit="|G|")
+def _group_ring_mul(n):
+    rng = random.Random(n)
+    ring = group_algebra.GroupRing(int, groups.CyclicGroup(n))
+    x = ring([rng.randrange(100) for _ in range(n)])
+    y = ring([rng.randrange(100) for _ in range(n)])
+    return lambda: x * y
+
+
+# m
+
+
+@case("m.m_factor", [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], unit="m")
+def _m_factor(size):
+    # The M-number just below size with the most prime factors in M
+    candidates = range(size - (size - 1) % 4, size - 400, -4)
+    target = max(candidates, key=lambda n: len(prime.prime_factor(n)))
+    return lambda: m.m_factor(target)
+
+
+# multiplicative
+
+
+@case("multiplicative.sieve_multiplicative", [10 ** 4, 10 ** 5, 10 ** 6])
+def _sieve_multiplicative(n):
+    return lambda: multiplicative.sieve_multiplicative(n)
+
+
+# ppts
+
+
+@case("ppts.count_ppts", [10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8], unit="limit")
+def _count_ppts(limit):
+    return lambda: ppts.count_ppts(limit)
+
+
+# rings
+
+
+@case("rings.PolynomialRing.__mul__", [64, 256, 1024, 4096], unit="degree")
+def _polynomial_mul(degree):
+    rng = random.Random(degree)
+    p = _random_prime(rng, 61)
+    ring = rings.PolynomialRing(rings.ModularIntegers(p))
+    x = ring([rng.randrange(p) for _ in range(degree + 1)])
+    y = ring([rng.randrange(p) for _ in range(degree + 1)])
+    return lambda: x * y
+
+
+@case("rings.PolynomialRing.powmod", [16, 64, 256, 1024], unit="degree")
+def _polynomial_powmod(degree):
+    rng = random.Random(degree)
+    p = _random_prime(rng, 61)
+    ring = rings.PolynomialRing(rings.ModularIntegers(p))
+    f = ring([rng.randrange(p) for _ in range(degree)] + [1])
+    return lambda: ring.x.powmod(p, f)
+
+
+# characters
+
+
+@case("characters.character_table", [16, 32, 64, 128], unit="|G|")
+def _character_table(n):
+    group = groups.DihedralGroup(n)
+    # The Cayley table and conjugacy classes stay cached between runs
+    characters.conjugacy_classes(group)
+    return lambda: characters.character_table.__wrapped__(group)
+
+
+# gaussian
+
+
+@case("gaussian.sums_of_two_squares", [2, 4, 6, 8], unit="primes")
+def _sums_of_two_squares(count):
+    rng = random.Random(count)
+    factors = [_random_prime(rng, 16, 1, 4) for _ in range(count)]
+    n = 1
+    for p in factors:
+        n *= p
+    return lambda: gaussian.sums_of_two_squares(n, factors)
+
+
+@case("gaussian.r2_range", [10 ** 4, 10 ** 5, 10 ** 6])
+def _r2_range(n):
+    return lambda: gaussian.r2_range(n, 2 * n)
+
+
+# residues
+
+
+@case("residues.PowerResidues.to_list", [10 ** 4, 10 ** 5, 10 ** 6], unit="p")
+def _power_residues(size):
+    p = prime.segmented_sieve(size, 2 * size)[0]
+    return lambda: residues.PowerResidues(p, 3, [p]).to_list()
+
+
+# modcontext
+
+
+@case("modcontext.ModContext.pow", [256, 1024, 4096], unit="bits")
+def _modcontext_pow(bits):
+    rng = random.Random(bits)
+    context = modcontext.ModContext(rng.getrandbits(bits) | (1 << (bits - 1)) | 1)
+    a, e = rng.randrange(context.m), rng.getrandbits(bits)
+    return lambda: context.pow(a, e)
+
+
+# group_algorithms
+
+
+@case("group_algorithms.discrete_log", [16, 20, 24, 28], unit="bits")
+def _group_discrete_log(bits):
+    rng = random.Random(bits)
+    q = _random_prime(rng, bits)
+    group = groups.CyclicGroup(q)
+    g, h = group(rng.randrange(1, q)), group(rng.randrange(q))
+    return lambda: group_algorithms.discrete_log(g, h, q, [q])
+
+
+# order
+
+
+@case("order.find_order", [64, 256, 1024], unit="bits")
+def _find_order(bits):
+    rng = random.Random(bits)
+    context = modcontext.ModContext(_random_prime(rng, bits))
+    a = rng.randrange(2, context.m)
+    # Factor p - 1 once, so the runs time the order and not the factoring
+    order.find_order(a, context)
+    return lambda: order.find_order(a, context)
+
+
+# descent
+
+
+@case("descent.find_sum_of_squares", [64, 256, 1024], unit="bits")
+def _find_sum_of_squares(bits):
+    p = _random_prime(random.Random(bits), bits, 1, 4)
+    return lambda: descent.find_sum_of_squares(p, False)
+
+
+# hw04
+
+
+@case("hw04.pow", [256, 1024, 4096], unit="bits")
+def _hw04_pow(bits):
+    rng = random.Random(bits)
+    n = rng.getrandbits(bits) | 1
+    a, k = rng.randrange(n), rng.getrandbits(bits)
+    return lambda: hw04.pow(a, k, n)
+
+
+# babystep_giantstep
+
+
+@case("babystep_giantstep.babystep_giantstep", [16, 20, 24, 28], unit="bits")
+def _babystep_giantstep(bits):
+    rng = random.Random(bits)
+    p = _random_prime(rng, bits)
+    g = discrete_log.find_generator(p)
+    h = pow(g, rng.randrange(1, p - 1), p)
+    return lambda: babystep_giantstep.babystep_giantstep(p, g, h)
+
+
+# primestore
+
+
+@case("primestore.PrimeStore.primes_between", [10 ** 5, 10 ** 6, 10 ** 7])
+def _primes_between(n):
+    directory = tempfile.TemporaryDirectory()
+    store = primestore.PrimeStore(os.path.join(directory.name, "primes"), n)
+
+    def run():
+        return sum(1 for _ in store.primes_between(0, n))
+
+    # The directory is removed once the case is done with run
+    run.directory = directory
+    return run
+
+
+# groups
+
+
+@case("groups.SymmetricGroup.__pow__", [10, 100, 1000], unit="n")
+def _symmetric_pow(n):
+    rng = random.Random(n)
+    values = list(range(1, n + 1))
+    rng.shuffle(values)
+    x = groups.SymmetricGroup(n)(values)
+    return lambda: x ** (2 ** 64 + 1)
@@ -0,0 +1,7 @@
+# This module now lives in the number_theory package. Importing it by its
+# old top-level name gives the package's module object itself
+import sys
+
+from number_theory import ecm
+
+sys.modules[__name__] = ecm
@@ -0,0 +1,59 @@
+"""The number theory programs as one package
+
+The modules are imported lazily, on first access as attributes of the
+package, so importing the package itself costs next to nothing:
+
+    import number_theory
+    number_theory.prime.prime_factor(2 ** 64 + 1)
+
+The modules import each other relatively, so the package works from
+wherever it is installed. The files at the top of the repository are thin
+shims which hand back these same module objects, so `import prime` and
+`from prime import prime_factor` keep working in scripts run from there.
+"""
+import importlib
+
+MODULES = (
+    "babystep_giantstep",
+    "characters",
+    "descent",
+    "discrete_log",
+    "e",
+    "ecm",
+    "elliptic",
+    "euclid",
+    "gaussian",
+    "group_algebra",
+    "group_algorithms",
+    "groups",
+    "hw04",
+    "interning",
+    "jacobi",
+    "m",
+    "memo",
+    "modcontext",
+    "mullin",
+    "multiplicative",
+    "order",
+    "ppts",
+    "prime",
+    "primecount",
+    "primestore",
+    "profiling",
+    "residues",
+    "rings",
+    "sqrtmod",
+    "tracing",
+)
+
+
+def __getattr__(name):
+    if name in MODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))
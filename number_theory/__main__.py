@@ -0,0 +1,44 @@
+"""Run number theory jobs from JSON lines: python -m number_theory [jobs.jsonl]"""
+import argparse
+import sys
+
+from number_theory import batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m number_theory", description=__doc__
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="file of jobs, or - for standard input"
+    )
+    parser.add_argument("-o", "--output", help="write results here, not to stdout")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: one per CPU, 0 for none)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=batch.CHUNK_SIZE)
+    parser.add_argument("--list", action="store_true", help="list the operations")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for op, target in batch.OPERATIONS.items():
+            print(f"{op:24}{target}")
+        return 0
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output is None else open(args.output, "w")
+    try:
+        batch.run_batch(source, sink, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import math
 
-from euclid import extended_euclidean
+from .euclid import extended_euclidean
 
 
 def babystep_giantstep(p, g, h):
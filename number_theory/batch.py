@@ -0,0 +1,123 @@
+"""Run jobs given as JSON lines, in a pool of worker processes
+
+Each job is a line like
+
+    {"op": "prime_factor", "args": [1000001], "id": 7}
+
+with optional "kwargs", and gives one line of output, in the same order as
+the input, holding the "id" (if any) and either the "result" or an "error".
+"""
+import collections
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# The operations jobs can name, as "module:function" for a module of the package
+OPERATIONS = {
+    "prime_factor": "prime:prime_factor",
+    "is_prime": "prime:is_prime",
+    "rabin_miller": "prime:rabin_miller",
+    "korselts": "prime:korselts",
+    "prime_pi": "primecount:prime_pi",
+    "nth_prime": "primecount:nth_prime",
+    "jacobi": "jacobi:jacobi",
+    "extended_euclidean": "euclid:extended_euclidean",
+    "inverse": "euclid:inverse",
+    "crt": "euclid:crt_many",
+    "sqrt_mod": "sqrtmod:sqrt_mod",
+    "cornacchia": "sqrtmod:cornacchia",
+    "find_order": "order:find_order",
+    "find_generator": "discrete_log:find_generator",
+    "discrete_log": "discrete_log:discrete_log",
+    "sums_of_two_squares": "gaussian:sums_of_two_squares",
+    "r2": "gaussian:r2",
+    "multiplicative_values": "multiplicative:multiplicative_values",
+    "carmichael_numbers": "multiplicative:carmichael_numbers",
+    "count_ppts": "ppts:count_ppts",
+    "count_points": "batch:count_points",
+}
+
+CHUNK_SIZE = 64
+
+_functions = {}
+
+
+def count_points(a, b, c, p):
+    """Count the solutions to y^2 = x^3 + ax^2 + bx + c modulo a prime p"""
+    from .elliptic import EllipticCurve
+
+    return EllipticCurve(a, b, c).count_solutions_mod_p(p)
+
+
+def _function(op):
+    function = _functions.get(op)
+    if function is None:
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation {op!r}")
+        module, name = OPERATIONS[op].split(":")
+        function = _functions[op] = getattr(
+            importlib.import_module(f".{module}", __package__), name
+        )
+    return function
+
+
+def run_job(line):
+    """Run one job line, returning its output line"""
+    output = {}
+    try:
+        job = json.loads(line)
+        if "id" in job:
+            output["id"] = job["id"]
+        function = _function(job["op"])
+        output["result"] = function(*job.get("args", ()), **job.get("kwargs", {}))
+    except Exception as e:
+        output.pop("result", None)
+        output["error"] = f"{type(e).__name__}: {e}"
+    return json.dumps(output, default=str)
+
+
+def run_chunk(lines):
+    """Run a chunk of job lines, returning their output as one string"""
+    return "".join(run_job(line) + "\n" for line in lines)
+
+
+def _chunks(lines, size):
+    chunk = []
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(lines, output=None, workers=None, chunk_size=CHUNK_SIZE):
+    """Run the job lines, writing the output lines in order as soon as
+    they are ready
+
+    Jobs are sent to the workers in chunks, and only a few chunks per worker
+    are in flight at once, so any amount of input streams through in
+    bounded memory. With workers=0 the jobs are run in this process.
+    """
+    output = output or sys.stdout
+    if workers == 0:
+        for chunk in _chunks(lines, chunk_size):
+            output.write(run_chunk(chunk))
+            output.flush()
+        return
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+    with ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for chunk in _chunks(lines, chunk_size):
+            pending.append(pool.submit(run_chunk, chunk))
+            if len(pending) >= window:
+                output.write(pending.popleft().result())
+                output.flush()
+        while pending:
+            output.write(pending.popleft().result())
+            output.flush()
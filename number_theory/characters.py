@@ -0,0 +1,388 @@
+# Conjugacy classes and character tables of groups following the interface
+# in groups.py, cached on each group class
+#
+# Classes are listed in the order of their first elements in the group's
+# iteration order, so the identity's class comes first, and each class
+# lists its elements in that order too.
+
+import cmath
+import functools
+import math
+import operator
+import random
+
+from .discrete_log import find_generator
+from .prime import rabin_miller
+from .rings import ModularIntegers, PolynomialRing
+
+# Character values within this of an integer are taken to be that integer
+ROUNDING = 1e-9
+
+
+def _per_group(fn):
+    """Cache a function of a group class on the class itself, in its
+    _character_data dict, so the results are freed along with the class"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(G):
+        # Look in the class's own dict, so subclasses do not share results
+        data = G.__dict__.get("_character_data")
+        if data is None:
+            data = {}
+            G._character_data = data
+        if name not in data:
+            data[name] = fn(G)
+        return data[name]
+
+    return wrapper
+
+
+@_per_group
+def cayley_table(G):
+    """Get (elements, table, inverses), where table[i][j] is the index of
+    elements[i] * elements[j] and inverses[i] that of elements[i]'s inverse"""
+    elements = list(G.__iter__())
+    index = {g: i for i, g in enumerate(elements)}
+    table = [[index[g * h] for h in elements] for g in elements]
+    inverses = [row.index(0) for row in table]
+    return elements, table, inverses
+
+
+@_per_group
+def conjugacy_classes(G):
+    """List the conjugacy classes of a group, each as a list of elements
+
+    Groups with a `get_conjugacy_classes` class method give their own;
+    otherwise each class is the orbit of an element under conjugation,
+    read off the Cayley table.
+    """
+    if hasattr(G, "get_conjugacy_classes"):
+        return G.get_conjugacy_classes()
+    elements, table, inverses = cayley_table(G)
+    seen = [False] * len(elements)
+    classes = []
+    for g in range(len(elements)):
+        if seen[g]:
+            continue
+        orbit = {table[table[h][g]][inverses[h]] for h in range(len(elements))}
+        for x in orbit:
+            seen[x] = True
+        classes.append([elements[x] for x in sorted(orbit)])
+    return classes
+
+
+@_per_group
+def class_lookup(G):
+    """Get a dict from each element to the index of its conjugacy class"""
+    return {g: i for i, c in enumerate(conjugacy_classes(G)) for g in c}
+
+
+@_per_group
+def class_indices(G):
+    """List the index of the conjugacy class of each element, in the
+    group's iteration order"""
+    lookup = class_lookup(G)
+    return [lookup[g] for g in G.__iter__()]
+
+
+@_per_group
+def character_table(G):
+    """Get the character table of a group, as a list of the irreducible
+    characters, each a list of its values on the conjugacy classes
+
+    The trivial character comes first. Values which are integers are given
+    as ints, and others as complex numbers. Groups with a
+    `get_character_table` class method give their own, symmetric groups use
+    the Murnaghan-Nakayama rule, and other groups the Dixon-Schneider method.
+    """
+    if hasattr(G, "get_character_table"):
+        return G.get_character_table()
+    if hasattr(G, "get_cycle_type"):
+        types = [c[0].get_cycle_type() for c in conjugacy_classes(G)]
+        return [
+            [symmetric_character(shape, cycle_type) for cycle_type in types]
+            for shape in partitions(sum(types[0]))
+        ]
+    return _dixon_schneider(G)
+
+
+# Symmetric groups
+
+
+def partitions(n, largest=None):
+    """List the partitions of n, with the largest parts first, in reverse
+    lexicographic order"""
+    largest = n if largest is None else largest
+    if n == 0:
+        return [()]
+    return [
+        (k,) + rest
+        for k in range(min(n, largest), 0, -1)
+        for rest in partitions(n - k, k)
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def symmetric_character(shape, cycle_type):
+    """Get the value of the character of the symmetric group given by a
+    partition, on permutations of the given cycle type
+
+    By the Murnaghan-Nakayama rule, this is a signed sum over the ways to
+    remove a rim hook of the length of the first cycle. Rim hooks are
+    removed by moving a bead back along the beta-set of the partition, and
+    the sign is the parity of the beads jumped over.
+    """
+    if not cycle_type:
+        return 1
+    r, rest = cycle_type[0], cycle_type[1:]
+    beta = [part + len(shape) - 1 - i for i, part in enumerate(shape)]
+    beads = set(beta)
+    total = 0
+    for i, b in enumerate(beta):
+        if b < r or b - r in beads:
+            continue
+        jumped = sum(1 for c in beta if b - r < c < b)
+        moved = sorted(beta[:i] + [b - r] + beta[i + 1 :], reverse=True)
+        smaller = tuple(c - (len(moved) - 1 - j) for j, c in enumerate(moved))
+        smaller = tuple(part for part in smaller if part > 0)
+        total += (-1) ** jumped * symmetric_character(smaller, rest)
+    return total
+
+
+# The Dixon-Schneider method
+
+
+def _exponent(G, classes):
+    """Get the least common multiple of the orders of the class
+    representatives, and the classes of each one's powers"""
+    lookup = class_lookup(G)
+    exponent = 1
+    powers = []
+    for c in classes:
+        g, x, cycle = c[0], G.e, []
+        while True:
+            cycle.append(lookup[x])
+            x = x * g
+            if x == G.e:
+                break
+        powers.append(cycle)
+        exponent = math.lcm(exponent, len(cycle))
+    return exponent, powers
+
+
+def _class_matrices(G, classes):
+    """Get a[j][i][l], the number of x in class i with x^-1 g_l in class j,
+    for representatives g_l, so that C_i C_j is the sum of a[j][i][l] C_l"""
+    elements, table, inverses = cayley_table(G)
+    lookup = class_lookup(G)
+    index = {g: i for i, g in enumerate(elements)}
+    which = [lookup[g] for g in elements]
+    k = len(classes)
+    a = [[[0] * k for _ in range(k)] for _ in range(k)]
+    for l, c in enumerate(classes):
+        g = index[c[0]]
+        for i, members in enumerate(classes):
+            for x in members:
+                a[which[table[inverses[index[x]]][g]]][i][l] += 1
+    return a
+
+
+def _rref(rows, p):
+    """Row reduce vectors modulo p, returning the nonzero rows and their
+    pivot columns"""
+    rows = [list(r) for r in rows]
+    pivots = []
+    r = 0
+    for col in range(len(rows[0]) if rows else 0):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][col]), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        inverse = pow(rows[r][col], -1, p)
+        rows[r] = [v * inverse % p for v in rows[r]]
+        for i in range(len(rows)):
+            if i != r and rows[i][col]:
+                f = rows[i][col]
+                rows[i] = [(v - f * w) % p for v, w in zip(rows[i], rows[r])]
+        pivots.append(col)
+        r += 1
+    return rows[:r], pivots
+
+
+def _null_space(matrix, p):
+    """Find a basis of the vectors v with matrix v = 0 modulo p"""
+    size = len(matrix[0])
+    rows, pivots = _rref(matrix, p)
+    basis = []
+    for free in range(size):
+        if free in pivots:
+            continue
+        v = [0] * size
+        v[free] = 1
+        for row, col in zip(rows, pivots):
+            v[col] = -row[free] % p
+        basis.append(v)
+    return basis
+
+
+def _characteristic_polynomial(matrix, p):
+    """Find the characteristic polynomial of a matrix modulo p, lowest degree
+    first, by reducing the matrix to Hessenberg form"""
+    h = [list(row) for row in matrix]
+    d = len(h)
+    for m in range(1, d - 1):
+        pivot = next((i for i in range(m, d) if h[i][m - 1]), None)
+        if pivot is None:
+            continue
+        if pivot != m:
+            h[pivot], h[m] = h[m], h[pivot]
+            for row in h:
+                row[pivot], row[m] = row[m], row[pivot]
+        inverse = pow(h[m][m - 1], -1, p)
+        for i in range(m + 1, d):
+            u = h[i][m - 1] * inverse % p
+            if u:
+                # Subtract u times row m from row i, and add u times column
+                # i to column m, which is a similarity transform
+                h[i] = [(x - u * y) % p for x, y in zip(h[i], h[m])]
+                for row in h:
+                    row[m] = (row[m] + u * row[i]) % p
+    # The characteristic polynomials of the leading submatrices, from
+    # p_{m+1} = (x - h_mm) p_m - sum of h_im h_(i+1)i ... h_m(m-1) p_i
+    polys = [[1]]
+    for m in range(d):
+        following = [0] + polys[m]
+        for t, c in enumerate(polys[m]):
+            following[t] = (following[t] - h[m][m] * c) % p
+        product = 1
+        for i in range(m - 1, -1, -1):
+            product = product * h[i + 1][i] % p
+            coefficient = h[i][m] * product % p
+            if coefficient:
+                for t, c in enumerate(polys[i]):
+                    following[t] = (following[t] - coefficient * c) % p
+        polys.append(following)
+    return polys[d]
+
+
+def _roots(coefficients, p, rng):
+    """Find the distinct roots modulo an odd prime p of a polynomial"""
+    ring = PolynomialRing(ModularIntegers(p))
+    f = ring(coefficients)
+    # Keep only the product of the distinct linear factors, then split it
+    # with gcds against (x + a)^((p-1)/2) - 1 for random a
+    pending = [(ring.x.powmod(p, f) - ring.x).gcd(f)]
+    roots = []
+    while pending:
+        g = pending.pop()
+        if g.degree == 1:
+            roots.append(-g[0].a % p)
+        elif g.degree > 1:
+            h = (ring.x + rng.randrange(p)).powmod((p - 1) // 2, g) - 1
+            d = h.gcd(g)
+            if 0 < d.degree < g.degree:
+                pending += [d, g // d]
+            else:
+                pending.append(g)
+    return roots
+
+
+def _split(a, k, p, rng):
+    """Find the common eigenvectors of the class matrices modulo p, each
+    scaled to be 1 on the identity's class"""
+    spaces = [_rref([[int(i == j) for j in range(k)] for i in range(k)], p)[0]]
+    for j in range(1, k):
+        if all(len(space) == 1 for space in spaces):
+            break
+        matrix = a[j]
+        split = []
+        for space in spaces:
+            if len(space) == 1:
+                split.append(space)
+                continue
+            _, pivots = _rref(space, p)
+            images = [
+                [sum(matrix[i][l] * u[l] for l in range(k)) % p for i in range(k)]
+                for u in space
+            ]
+            # The matrix restricted to the space, in the basis of its rows
+            restricted = [[image[col] for image in images] for col in pivots]
+            for root in _roots(_characteristic_polynomial(restricted, p), p, rng):
+                shifted = [
+                    [(v - root * (r == c)) % p for c, v in enumerate(row)]
+                    for r, row in enumerate(restricted)
+                ]
+                vectors = [
+                    [sum(c * u[l] for c, u in zip(y, space)) % p for l in range(k)]
+                    for y in _null_space(shifted, p)
+                ]
+                split.append(_rref(vectors, p)[0])
+        spaces = split
+    assert all(len(space) == 1 for space in spaces), "Class matrices did not split"
+    return [
+        [v * pow(space[0][0], -1, p) % p for v in space[0]] for space in spaces
+    ]
+
+
+def _dixon_schneider(G):
+    classes = conjugacy_classes(G)
+    k = len(classes)
+    order = G.get_group_order()
+    sizes = [len(c) for c in classes]
+    exponent, powers = _exponent(G, classes)
+    lookup = class_lookup(G)
+    inverse_class = [lookup[c[0].multiplicative_inverse()] for c in classes]
+    # Work modulo a prime p = 1 mod the exponent, so the eigenvalues of every
+    # representation are in the field, with p > 2 sqrt(|G|) so degrees can
+    # be read off their squares
+    p = exponent + 1
+    while p <= 2 * math.isqrt(order) + 2 or not rabin_miller(p, 40):
+        p += exponent
+    zeta = pow(find_generator(p), (p - 1) // exponent, p)
+    rng = random.Random(order)
+    inverse_sizes = [pow(h, -1, p) for h in sizes]
+    # For each order m of an element, the powers of a primitive mth root of
+    # unity mod p used to find the multiplicities of the eigenvalues, and
+    # the complex roots of unity those stand for
+    transforms = {}
+    for m in {len(cycle) for cycle in powers}:
+        root = pow(zeta, -exponent // m, p)
+        steps = [pow(root, t, p) for t in range(m)]
+        transforms[m] = (
+            [[steps[e * l % m] for l in range(m)] for e in range(m)],
+            [cmath.exp(2j * math.pi * e / m) for e in range(m)],
+            pow(m, -1, p),
+        )
+    table = []
+    for omega in _split(_class_matrices(G, classes), k, p, rng):
+        # omega_i = h_i chi(g_i) / chi(1), and sum |chi(g)|^2 = |G|
+        s = sum(omega[i] * omega[inverse_class[i]] * inverse_sizes[i] for i in range(k))
+        square = order * pow(s, -1, p) % p
+        degree = next(d for d in range(1, math.isqrt(order) + 1) if d * d % p == square)
+        modular = [degree * omega[i] * inverse_sizes[i] % p for i in range(k)]
+        # Recover chi(g) from the multiplicities of each eigenvalue of g, which
+        # are averages of chi(g^l) against powers of a root of unity
+        row = []
+        for cycle in powers:
+            weights, unity, inverse_m = transforms[len(cycle)]
+            values = [modular[c] for c in cycle]
+            value = 0
+            for w, z in zip(weights, unity):
+                multiplicity = sum(map(operator.mul, values, w)) * inverse_m % p
+                if multiplicity:
+                    value += multiplicity * z
+            row.append(_clean(value))
+        table.append(row)
+    table.sort(key=lambda row: (row[0] != 1 or any(v != 1 for v in row), row[0]))
+    return table
+
+
+def _clean(value):
+    """Round a character value to an int, or its parts to ints, where close"""
+    re, im = value.real, value.imag
+    if abs(re - round(re)) < ROUNDING:
+        re = round(re)
+    if abs(im - round(im)) < ROUNDING:
+        im = round(im)
+    return re if im == 0 and type(re) is int else complex(re, im)
@@ -0,0 +1,107 @@
+from . import tracing
+from .sqrtmod import cornacchia, sqrt_mod
+
+tracing.register_latex(
+    {
+        "descent.step": (
+            "From ${A}^2 + {B}^2 = {p}M$, we solve and find that $M = {m}$. "
+            "Reducing modulo $M$, we find $A \\equiv {u}, B \\equiv {v}$. "
+            "Thus, we can take $A = {new_A}, B = {new_B}$ as a new solution "
+            "equal to a smaller multiple of {p}.\n\n"
+        ),
+        "descent.done": (
+            "Now, ${A}^2 + {B}^2 = {p}$, so we have found the solution.\n"
+        ),
+        "sum_of_squares.no_root": (
+            "There is no solution to the congruence "
+            "$x^2 + 1 \\equiv 0 \\pmod{{{n}}}$, so no such solution exists.\n"
+        ),
+        "sum_of_squares.root": (
+            "We find that the congruence $x^2+1 \\equiv 0 \\pmod{{{n}}}$ "
+            "has a solution at $x = {x}$.\n\n"
+        ),
+        "sum_of_squares.no_solution": (
+            "Cornacchia's algorithm finds no solution from this $x$.\n"
+        ),
+        "sum_of_squares.found": (
+            "By Cornacchia's algorithm, ${A}^2 + {B}^2 = {n}$, "
+            "so we have found the solution.\n"
+        ),
+    }
+)
+
+
+def descent(A, B, p, num_iters=None, print_output=True):
+    """Perform Fermat's Descent, from two numbers A, B such that
+    A**2 + B**2 = Mp for some multiple 1 < M < p.
+
+    Repeat for the given number of times, or until you find A, B such that
+    A**2 + B**2 = p.
+    """
+    if not print_output and not tracing.active():
+        return _descent(A, B, p, num_iters)
+    with tracing.latex_output(print_output):
+        return _descent(A, B, p, num_iters)
+
+
+def _descent(A, B, p, num_iters):
+    traced = tracing.active()
+    if (A ** 2 + B ** 2) % p != 0:
+        return
+    iter = 0
+    while A ** 2 + B ** 2 != p:
+        if iter == num_iters:
+            return A, B
+        m = (A ** 2 + B ** 2) // p
+        u = A % m
+        if u >= m / 2:
+            u -= m
+        v = B % m
+        if v >= m / 2:
+            v -= m
+        iter += 1
+        oldA, oldB = A, B
+        A, B = abs((u * A + v * B) // m), abs((v * A - u * B) // m)
+        if traced:
+            tracing.emit(
+                "descent.step",
+                A=oldA,
+                B=oldB,
+                p=p,
+                m=m,
+                u=u,
+                v=v,
+                new_A=A,
+                new_B=B,
+            )
+    if traced:
+        tracing.emit("descent.done", A=A, B=B, p=p)
+    return A, B
+
+
+def find_sum_of_squares(n, print_output=True):
+    """Find n as a sum of two squares, if such a solution exists"""
+    if not print_output and not tracing.active():
+        return _find_sum_of_squares(n)
+    with tracing.latex_output(print_output):
+        return _find_sum_of_squares(n)
+
+
+def _find_sum_of_squares(n):
+    traced = tracing.active()
+    x = sqrt_mod(-1, n)
+    if x is None:
+        if traced:
+            tracing.emit("sum_of_squares.no_root", n=n)
+        return
+    if traced:
+        tracing.emit("sum_of_squares.root", n=n, x=x)
+    solution = cornacchia(n, root=x)
+    if solution is None:
+        if traced:
+            tracing.emit("sum_of_squares.no_solution")
+        return
+    A, B = solution
+    if traced:
+        tracing.emit("sum_of_squares.found", A=A, B=B, n=n)
+    return A, B
@@ -0,0 +1,416 @@
+import json
+import math
+import random
+from collections import Counter, OrderedDict
+from math import gcd
+
+from .euclid import crt_many, product_tree, remainder_tree
+from .memo import cached
+from .modcontext import ModContext
+from .prime import eratosthenes, prime_factor, rabin_miller
+
+# Below this, discrete_log simply walks the powers of g
+INDEX_CALCULUS_MIN_P = 2 ** 20
+# Prime factors q of p-1 at least this large have their logs found by
+# linear algebra modulo q, and smaller ones by baby-step giant-step
+INDEX_CALCULUS_MIN_Q = 2 ** 24
+# How many relations to collect beyond the size of the factor base
+INDEX_CALCULUS_EXTRA_RELATIONS = 20
+# Generators modulo primes above this are cached, see `memo`
+GENERATOR_CACHE_MIN = 2 ** 32
+# Index calculus solvers (with their factor base logs) kept for reuse
+INDEX_CALCULUS_SOLVERS = 8
+
+
+def iterate_powers(g, p):
+    """Iterate over the powers of g mod p, where p may be a `ModContext`"""
+    context = ModContext.of(p)
+    g %= context.m
+    i = 1
+    while True:
+        yield i
+        i = context.mul(i, g)
+
+
+@cached(when=lambda p: p > GENERATOR_CACHE_MIN)
+def find_generator(p):
+    """Find a generator for (Z/pZ)*, for any prime p"""
+    cofactors = [(p - 1) // q for q in set(prime_factor(p - 1))]
+    for a in range(2, p):
+        if all(pow(a, c, p) != 1 for c in cofactors):
+            return a
+    return None
+
+
+def find_all_generators(p):
+    """Find a list of all generators for (Z/pZ)*, for any prime p"""
+    g = find_generator(p)
+    return [pow(g, a, p) for a in range(1, p - 1) if gcd(a, p - 1) == 1]
+
+
+@cached(when=lambda g, p, a: p >= INDEX_CALCULUS_MIN_P)
+def discrete_log(g, p, a):
+    """Solve g^h = a (mod p) for the least h >= 0.
+
+    Large prime p are solved by index calculus when g is a generator, and
+    the factor base logs are kept so later calls with the same g and p are
+    fast. Other large p are solved by baby-step giant-step.
+    """
+    if p < INDEX_CALCULUS_MIN_P or gcd(g, p) != 1:
+        return next(i for (i, pow) in enumerate(iterate_powers(g, p)) if pow == a)
+    if not (rabin_miller(p, 40) and _is_generator(g, p)):
+        return _baby_step_giant_step(g, p, a)
+    solver = _index_calculus_solvers.pop((g, p), None)
+    if solver is None:
+        solver = IndexCalculus(g, p)
+    _index_calculus_solvers[(g, p)] = solver
+    if len(_index_calculus_solvers) > INDEX_CALCULUS_SOLVERS:
+        _index_calculus_solvers.popitem(last=False)
+    return solver.log(a)
+
+
+_index_calculus_solvers = OrderedDict()
+
+
+def _is_generator(g, p):
+    return all(pow(g, (p - 1) // q, p) != 1 for q in set(prime_factor(p - 1)))
+
+
+def _baby_step_giant_step(g, p, a):
+    """Find the least h >= 0 with g^h = a (mod p), for g a unit mod p"""
+    steps, m, giant = _baby_steps(g % p, p, p)
+    h = a % p
+    # Every power of g is g^h for some h < p <= m(m + 1)
+    for j in range(m + 1):
+        if h in steps:
+            return steps[h] + j * m
+        h = h * giant % p
+    raise ValueError(f"{a} is not a power of {g} modulo {p}")
+
+
+def _subgroup_log(gamma, h, q, p, table=None):
+    """Solve gamma^x = h (mod p) for 0 <= x < q, where gamma has order q,
+    by baby-step giant-step. A table from `_baby_steps` can be passed in."""
+    steps, m, giant = table or _baby_steps(gamma, q, p)
+    for j in range(m + 1):
+        if h in steps:
+            return (steps[h] + j * m) % q
+        h = h * giant % p
+    raise ValueError(f"Logarithm does not exist modulo {p}")
+
+
+def _baby_steps(gamma, q, p):
+    m = math.isqrt(q) + 1
+    steps = {}
+    power = 1
+    for i in range(m):
+        steps.setdefault(power, i)
+        power = power * gamma % p
+    return steps, m, pow(gamma, -m, p)
+
+
+class SparseSolver:
+    """Incremental solver for a sparse linear system modulo a prime q
+
+    Each row is a dictionary mapping columns to coefficients, with a
+    right-hand side. Rows are eliminated as they are added, each pivoting on
+    its largest column, since in a factor base those are the rarest and
+    cause the least fill-in.
+    """
+
+    def __init__(self, q):
+        self.q = q
+        self._pivots = {}
+        self._order = []
+
+    def add_row(self, coeffs, rhs):
+        """Add the equation sum(coeffs[c] * x_c) = rhs"""
+        q = self.q
+        pivots = self._pivots
+        row = {c: v % q for (c, v) in coeffs.items() if v % q != 0}
+        rhs %= q
+        # Eliminate from the largest column down, so that fill-in from a
+        # pivot row (which only has columns below its pivot) is handled later
+        pending = sorted((c for c in row if c in pivots), reverse=True)
+        while pending:
+            c = pending.pop(0)
+            v = row.pop(c, 0)
+            if v == 0:
+                continue
+            pivot_row, pivot_rhs = pivots[c]
+            for c2, v2 in pivot_row.items():
+                if c2 == c:
+                    continue
+                w = (row.get(c2, 0) - v * v2) % q
+                if w:
+                    if c2 not in row and c2 in pivots:
+                        pending.append(c2)
+                        pending.sort(reverse=True)
+                    row[c2] = w
+                else:
+                    row.pop(c2, None)
+            rhs = (rhs - v * pivot_rhs) % q
+        if not row:
+            return
+        c = max(row)
+        inv = pow(row[c], -1, q)
+        pivots[c] = ({c2: v * inv % q for (c2, v) in row.items()}, rhs * inv % q)
+        self._order.append(c)
+
+    def rank(self):
+        """Get the rank of the system so far"""
+        return len(self._order)
+
+    def solve(self):
+        """Get the values of every column which the system determines"""
+        values = {}
+        for c in reversed(self._order):
+            row, rhs = self._pivots[c]
+            if any(c2 != c and c2 not in values for c2 in row):
+                continue
+            values[c] = (
+                rhs - sum(v * values[c2] for (c2, v) in row.items() if c2 != c)
+            ) % self.q
+        return values
+
+
+class IndexCalculus:
+    """Discrete logarithms to a fixed generator g modulo a fixed prime p
+
+    The logs of a factor base of small primes are found once, modulo each
+    large prime factor of p-1, from relations g^k = r/t (mod p) with r and t
+    both about sqrt(p) and smooth. Smoothness is tested in batches with a
+    remainder tree. Small prime factors of p-1 are handled by
+    Pohlig-Hellman with baby-step giant-step instead.
+    """
+
+    def __init__(self, g, p, bound=None, factors=None, logs=None):
+        self.g = g % p
+        self.p = p
+        self.order_factors = Counter(factors or prime_factor(p - 1))
+        for q in self.order_factors:
+            if pow(self.g, (p - 1) // q, p) == 1:
+                raise ValueError(f"{g} is not a generator modulo {p}")
+        if bound is None:
+            # L_p(1/2, 1/2), scaled to fit timings of 48 to 80 bit primes
+            ln = math.log(p)
+            bound = max(int(10 * math.exp(0.5 * math.sqrt(ln * math.log(ln)))), 100)
+        self.bound = bound
+        self.primes = eratosthenes(bound)
+        self._product = math.prod(self.primes)
+        self.large_factors = [
+            q
+            for (q, e) in sorted(self.order_factors.items())
+            if q >= INDEX_CALCULUS_MIN_Q and e == 1
+        ]
+        self._tables = {}
+        if logs is None:
+            logs = {q: self._solve_factor_base(q) for q in self.large_factors}
+        self.logs = logs
+
+    # Relations
+
+    def _split(self, y):
+        """Write y = r/t (mod p) with r, t about sqrt(p), returning (r, t)"""
+        r0, r1 = self.p, y
+        t0, t1 = 0, 1
+        while r1 * r1 > self.p:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            t0, t1 = t1, t0 - q * t1
+        return r1, t1
+
+    def _factor_smooth(self, values):
+        """Factor each value over the factor base, or give None if it is not
+        smooth, testing smoothness for the whole batch at once"""
+        remainders = remainder_tree(self._product, product_tree(values))
+        factorizations = []
+        for v, r in zip(values, remainders):
+            k = v.bit_length().bit_length()
+            if v != 1 and pow(r, 1 << k, v) != 0:
+                factorizations.append(None)
+                continue
+            exponents = {}
+            for prime in self.primes:
+                if v == 1:
+                    break
+                while v % prime == 0:
+                    v //= prime
+                    exponents[prime] = exponents.get(prime, 0) + 1
+            factorizations.append(exponents)
+        return factorizations
+
+    def _relations(self, base, batch_size=256):
+        """Generate (k, exponents, sign) such that base * g^k is the product
+        of the factor base primes to those exponents, times -1 if sign"""
+        while True:
+            batch = []
+            # Consecutive exponents, so each candidate costs one multiplication
+            k = random.randrange(1, self.p - 1)
+            y = base * pow(self.g, k, self.p) % self.p
+            for i in range(batch_size):
+                r, t = self._split(y)
+                if r != 0:
+                    batch.append((k + i, r, t))
+                y = y * self.g % self.p
+            values = [abs(v) for (_, r, t) in batch for v in (r, t)]
+            factored = self._factor_smooth(values)
+            for i, (k, r, t) in enumerate(batch):
+                fr, ft = factored[2 * i], factored[2 * i + 1]
+                if fr is None or ft is None:
+                    continue
+                exponents = dict(fr)
+                for prime, e in ft.items():
+                    exponents[prime] = exponents.get(prime, 0) - e
+                yield k, exponents, t < 0
+
+    def _solve_factor_base(self, q):
+        """Find the logs of the factor base primes modulo q"""
+        half = (self.p - 1) // 2
+        solver = SparseSolver(q)
+        if self.g in self.primes:
+            solver.add_row({self.g: 1}, 1)
+        extra = 0
+        for k, exponents, negative in self._relations(1):
+            solver.add_row(exponents, k + (half if negative else 0))
+            if solver.rank() < len(self.primes):
+                continue
+            extra += 1
+            if extra % INDEX_CALCULUS_EXTRA_RELATIONS == 0:
+                logs = solver.solve()
+                if len(logs) >= len(self.primes):
+                    return logs
+
+    # Logarithms
+
+    def _large_log(self, a):
+        """Find log(a) modulo every large factor of p-1, from one relation"""
+        half = (self.p - 1) // 2
+        for k, exponents, negative in self._relations(a, 16):
+            if all(
+                prime in self.logs[q] for q in self.large_factors for prime in exponents
+            ):
+                return [
+                    (
+                        sum(e * self.logs[q][prime] for (prime, e) in exponents.items())
+                        - k
+                        - (half if negative else 0)
+                    )
+                    % q
+                    for q in self.large_factors
+                ]
+
+    def _small_log(self, a, q, e):
+        """Find log(a) modulo q^e by Pohlig-Hellman"""
+        p = self.p
+        gamma = pow(self.g, (p - 1) // q, p)
+        if q not in self._tables:
+            self._tables[q] = _baby_steps(gamma, q, p)
+        x = 0
+        g_inv = pow(self.g, -1, p)
+        for i in range(e):
+            h = pow(a * pow(g_inv, x, p) % p, (p - 1) // q ** (i + 1), p)
+            x += _subgroup_log(gamma, h, q, p, self._tables[q]) * q ** i
+        return x
+
+    def log(self, a):
+        """Solve g^h = a (mod p) for 0 <= h < p-1"""
+        a %= self.p
+        if a == 0:
+            raise ValueError(f"0 has no logarithm modulo {self.p}")
+        residues = []
+        moduli = []
+        if self.large_factors:
+            residues += self._large_log(a)
+            moduli += self.large_factors
+        for q, e in self.order_factors.items():
+            if q not in self.large_factors:
+                residues.append(self._small_log(a, q, e))
+                moduli.append(q ** e)
+        return crt_many(residues, moduli)
+
+    # Persistence
+
+    def save(self, path):
+        """Save the factor base logs to a JSON file"""
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "g": self.g,
+                    "p": self.p,
+                    "bound": self.bound,
+                    "factors": list(self.order_factors.elements()),
+                    "logs": {
+                        str(q): {str(prime): v for (prime, v) in logs.items()}
+                        for (q, logs) in self.logs.items()
+                    },
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Load factor base logs saved by `save`, and register them for use
+        by discrete_log"""
+        with open(path) as f:
+            data = json.load(f)
+        logs = {
+            int(q): {int(prime): v for (prime, v) in q_logs.items()}
+            for (q, q_logs) in data["logs"].items()
+        }
+        solver = cls(data["g"], data["p"], data["bound"], data["factors"], logs)
+        _index_calculus_solvers[(solver.g, solver.p)] = solver
+        return solver
+
+
+def make_table(g, p, latex_output=False):
+    """Output the LaTeX for a table of discrete logs"""
+    targets = list(range(1, p))
+    logs = [discrete_log(g, p, i) for i in targets]
+    if latex_output:
+        print("\\begin{tabular}{ c|c }")
+        print("$a$ & $\\log_g(a)$ \\\\\n\\hline")
+        for target, log in zip(targets, logs):
+            print("{} & {} \\\\".format(target, log))
+        print("\\end{tabular}")
+    return dict(zip(targets, logs))
+
+
+def check_diffs(g, p):
+    """Check the differences of I(a) and I(b) in Z/pZ using g as a
+    primitive root. Outputs all values which the difference cannot
+    be."""
+    table = make_table(g, p, latex_output=False)
+    seen = [False for i in range(p - 1)]
+    for a in range(1, p):
+        b = (p + 1 - a) % p
+        if b == 0:
+            continue
+        diff = (table[a] - table[b] + p - 1) % (p - 1)
+        seen[diff] = True
+    return [i for i, s in enumerate(seen) if not s]
+
+
+def check_diffs_all_generators(p):
+    """Returns the output of check_diffs for all generators"""
+    return {g: check_diffs(g, p) for g in find_all_generators(p)}
+
+
+def check_sums(g, p):
+    """Check the sums of I(a) and I(b) in Z/pZ using g as a
+    primitive root. Outputs all values which the difference cannot
+    be."""
+    table = make_table(g, p, latex_output=False)
+    seen = [False for i in range(p - 1)]
+    for a in range(1, p):
+        b = (p + 1 - a) % p
+        if b == 0:
+            continue
+        sum = (table[a] + table[b]) % (p - 1)
+        seen[sum] = True
+    return [i for i, s in enumerate(seen) if not s]
+
+
+def check_sums_all_generators(p):
+    """Returns the output of check_diffs for all generators"""
+    return {g: check_sums(g, p) for g in find_all_generators(p)}
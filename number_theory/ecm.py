@@ -0,0 +1,144 @@
+import math
+import random
+
+from .prime import eratosthenes
+
+# (B1, curves) for finding factors of about 15, 20, 25, 30 and 35 digits
+SCHEDULE = ((2000, 25), (11000, 90), (50000, 300), (250000, 700), (1000000, 1800))
+# Stage 2 looks for one more prime factor of the group order up to B2 = B1
+# times this, with giant steps of STAGE2_D
+STAGE2_RATIO = 100
+STAGE2_D = 2310
+
+
+class _FoundFactor(Exception):
+    def __init__(self, factor):
+        self.factor = factor
+
+
+def _inverse(a, n):
+    """Invert a mod n, or raise _FoundFactor if a shares a factor with n"""
+    g = math.gcd(a, n)
+    if g != 1:
+        raise _FoundFactor(g)
+    return pow(a, -1, n)
+
+
+def _double(X, Z, a24, n):
+    s, d = (X + Z) * (X + Z) % n, (X - Z) * (X - Z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def _add(XP, ZP, XQ, ZQ, XD, ZD, n):
+    """Add P and Q on the curve, given D = P - Q"""
+    u = (XP - ZP) * (XQ + ZQ)
+    v = (XP + ZP) * (XQ - ZQ)
+    return ZD * (u + v) ** 2 % n, XD * (u - v) ** 2 % n
+
+
+def _multiply(X, Z, k, a24, n):
+    """Compute kP with the Montgomery ladder, for k >= 1"""
+    X1, Z1 = X, Z
+    X2, Z2 = _double(X, Z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            X1, Z1 = _add(X2, Z2, X1, Z1, X, Z, n)
+            X2, Z2 = _double(X2, Z2, a24, n)
+        else:
+            X2, Z2 = _add(X2, Z2, X1, Z1, X, Z, n)
+            X1, Z1 = _double(X1, Z1, a24, n)
+    return X1, Z1
+
+
+def _curve(sigma, n):
+    """Get a point (X, Z) and (A+2)/4 for Suyama's curve with parameter sigma"""
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    X = pow(u, 3, n)
+    Z = pow(v, 3, n)
+    a24 = pow(v - u, 3, n) * (3 * u + v) * _inverse(16 * X * v, n) % n
+    return X, Z, a24
+
+
+def ecm_curve(n, sigma, B1, B2=None, primes=None):
+    """Run one curve of Lenstra's elliptic curve method on n, returning a
+    nontrivial factor or None
+
+    Stage 1 multiplies a point by every prime power up to B1, and stage 2
+    looks for one more prime up to B2 with Montgomery's standard
+    continuation.
+    """
+    B2 = B2 or STAGE2_RATIO * B1
+    if primes is None:
+        primes = eratosthenes(B2)
+    try:
+        X, Z, a24 = _curve(sigma, n)
+        for p in primes:
+            if p > B1:
+                break
+            q = p
+            while q * p <= B1:
+                q *= p
+            X, Z = _multiply(X, Z, q, a24, n)
+        g = math.gcd(Z, n)
+        if g != 1:
+            return g if g != n else None
+        return _stage2(n, X, Z, a24, B1, B2, primes)
+    except _FoundFactor as e:
+        return e.factor if e.factor != n else None
+
+
+def _stage2(n, X, Z, a24, B1, B2, primes):
+    D = STAGE2_D
+    # Baby steps jQ for odd j < D/2, from (j-2)Q + 2Q
+    X2, Z2 = _double(X, Z, a24, n)
+    baby = {1: (X, Z)}
+    Xp, Zp = X, Z
+    Xj, Zj = _add(X2, Z2, X, Z, X, Z, n)
+    for j in range(3, D // 2, 2):
+        if j > 3:
+            Xj, Zj, Xp, Zp = (*_add(Xj, Zj, X2, Z2, Xp, Zp, n), Xj, Zj)
+        if math.gcd(j, D) == 1:
+            baby[j] = (Xj, Zj)
+    # Normalize the baby steps so each product term needs fewer operations
+    baby = {j: Xb * _inverse(Zb, n) % n for j, (Xb, Zb) in baby.items()}
+    # Giant steps mDQ, from (m-1)DQ + DQ
+    XD, ZD = _multiply(X, Z, D, a24, n)
+    m = max(1, (B1 + D // 2) // D)
+    Xm, Zm = _multiply(XD, ZD, m, a24, n)
+    Xl, Zl = _multiply(XD, ZD, m - 1, a24, n) if m > 1 else (None, None)
+    product = 1
+    i = 0
+    while i < len(primes) and primes[i] <= B1:
+        i += 1
+    while i < len(primes) and primes[i] <= B2:
+        # Each prime q = mD +- j with 0 < j < D/2 adds X_m - x_j Z_m
+        while primes[i] > m * D + D // 2:
+            if Xl is None:
+                Xm, Zm, Xl, Zl = (*_double(XD, ZD, a24, n), Xm, Zm)
+            else:
+                Xm, Zm, Xl, Zl = (*_add(Xm, Zm, XD, ZD, Xl, Zl, n), Xm, Zm)
+            m += 1
+        j = abs(primes[i] - m * D)
+        if j in baby:
+            product = product * (Xm - baby[j] * Zm) % n
+        i += 1
+    g = math.gcd(product, n)
+    return g if g not in (1, n) else None
+
+
+def ecm(n, schedule=SCHEDULE, rng=None):
+    """Find a nontrivial factor of a composite n, not a prime power, with the
+    elliptic curve method, working up through a schedule of (B1, curves)
+
+    Returns None if every curve of the schedule fails.
+    """
+    rng = rng or random.Random(n)
+    for B1, curves in schedule:
+        primes = eratosthenes(STAGE2_RATIO * B1)
+        for _ in range(curves):
+            d = ecm_curve(n, rng.randrange(6, n - 1), B1, primes=primes)
+            if d is not None:
+                return d
+    return None
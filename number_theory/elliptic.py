@@ -0,0 +1,292 @@
+from fractions import Fraction
+from math import gcd, isqrt
+
+from .jacobi import jacobi
+from .memo import cached
+from .rings import ModularIntegers
+from .sqrtmod import sqrt_mod_prime
+
+
+# Point counts modulo primes above this are cached, see `memo`
+POINT_COUNT_CACHE_MIN = 10 ** 4
+
+# Points are only reduced by the common factor of their coordinates once Z
+# has more bits than this
+REDUCE_BITS = 64
+
+# search_points only looks at x = u/w^2 for which the right hand side of
+# the curve is a square modulo each of these
+SIEVE_MODULI = (16, 9, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53)
+
+
+def _reduce_jacobian(X, Y, Z):
+    """Divide (X, Y, Z) through by the largest t with t^2 | X, t^3 | Y and
+    t | Z, which is exact when the x denominator is a square, as it is for
+    points on curves with integer coefficients"""
+    Z2 = Z * Z
+    d = Z2 // gcd(X, Z2)
+    w = isqrt(d)
+    if w * w == d and Z % w == 0:
+        t = Z // w
+        if Y % t ** 3 == 0:
+            return X // (t * t), Y // t ** 3, w
+    return X, Y, Z
+
+
+def _repeat_bits(pattern, period, length):
+    """Repeat a pattern of `period` bits until it is at least `length` long"""
+    while period < length:
+        pattern |= pattern << period
+        period *= 2
+    return pattern
+
+
+class EllipticCurve:
+    """A class which implements elliptic curves"""
+
+    def __init__(self, a, b, c):
+        self.a = a
+        self.b = b
+        self.c = c
+        curve = self
+
+        class Point:
+            """A rational point on the curve, kept as integers (X, Y, Z) in
+            Jacobian coordinates, with x = X/Z^2 and y = Y/Z^3, and Z = 0 at
+            infinity
+
+            Sums are found without any division, and the coordinates are
+            only reduced by their common factor once Z passes REDUCE_BITS.
+            """
+
+            __slots__ = ("X", "Y", "Z")
+
+            def __init__(self, x, y):
+                """Create a new point at (x, y). If the point at infinity
+                is wanted, pass x=None, y=None
+                """
+                if x is None:
+                    self.X, self.Y, self.Z = 1, 1, 0
+                    return
+                assert y is not None
+                # Convert to fractions on input to avoid floating-point errors
+                x = Fraction(x).limit_denominator() if type(x) is float else x
+                y = Fraction(y).limit_denominator() if type(y) is float else y
+                x, y = Fraction(x), Fraction(y)
+                # Any Z with both denominators dividing Z^2 and Z^3 will do,
+                # and for integer coefficients x = u/w^2 and y = v/w^3
+                q, r = x.denominator, y.denominator
+                w = r // q if r % q == 0 else q * r
+                if w * w % q or w ** 3 % r:
+                    w = q * r
+                self.X = x.numerator * (w * w // q)
+                self.Y = y.numerator * (w ** 3 // r)
+                self.Z = w
+                assert self.on_curve(), f"({x}, {y}) is not on {curve}"
+
+            @classmethod
+            def _make(cls, X, Y, Z):
+                point = object.__new__(cls)
+                if Z == 0:
+                    X, Y = 1, 1
+                elif Z.bit_length() > REDUCE_BITS:
+                    X, Y, Z = _reduce_jacobian(X, Y, Z)
+                point.X, point.Y, point.Z = X, Y, Z
+                return point
+
+            def on_curve(self):
+                """Check the curve equation, Y^2 = X^3 + aX^2Z^2 + bXZ^4 + cZ^6"""
+                X, Y, Z = self.X, self.Y, self.Z
+                Z2 = Z * Z
+                return Y * Y == ((X + a * Z2) * X + b * Z2 * Z2) * X + c * Z2 ** 3
+
+            @property
+            def x(self):
+                return None if self.Z == 0 else Fraction(self.X, self.Z ** 2)
+
+            @property
+            def y(self):
+                return None if self.Z == 0 else Fraction(self.Y, self.Z ** 3)
+
+            def reduced(self):
+                """Get the same point with its coordinates divided through by
+                their common factor"""
+                if self.Z == 0:
+                    return self
+                return Point._make(*_reduce_jacobian(self.X, self.Y, self.Z))
+
+            def __eq__(self, other):
+                if self.Z == 0 or other.Z == 0:
+                    return self.Z == other.Z
+                Z1s, Z2s = self.Z * self.Z, other.Z * other.Z
+                return (
+                    self.X * Z2s == other.X * Z1s
+                    and self.Y * Z2s * other.Z == other.Y * Z1s * self.Z
+                )
+
+            def __neq__(self, other):
+                return not self.__eq__(other)
+
+            def __neg__(self):
+                return Point._make(self.X, -self.Y, self.Z)
+
+            def double(self):
+                # The tangent has slope (3x^2 + 2ax + b) / 2y = M / 2YZ, and
+                # the three x values where it meets the curve sum to m^2-a
+                X, Y, Z = self.X, self.Y, self.Z
+                if Z == 0 or Y == 0:
+                    return Point(None, None)
+                Z2 = Z * Z
+                M = (3 * X + 2 * a * Z2) * X + b * Z2 * Z2
+                Z3 = 2 * Y * Z
+                Y2 = Y * Y
+                X3 = M * M - a * Z3 * Z3 - 8 * X * Y2
+                Y3 = M * (4 * X * Y2 - X3) - 8 * Y2 * Y2
+                return Point._make(X3, Y3, Z3)
+
+            def __add__(self, other):
+                # Identity point: get other point
+                if self.Z == 0:
+                    return other
+                elif other.Z == 0:
+                    return self
+                # Bring both points over the denominator (Z1 Z2)^2 or ^3
+                Z1s, Z2s = self.Z * self.Z, other.Z * other.Z
+                U1, U2 = self.X * Z2s, other.X * Z1s
+                S1, S2 = self.Y * Z2s * other.Z, other.Y * Z1s * self.Z
+                H, R = U2 - U1, S2 - S1
+                if H == 0:
+                    # Vertical lines: Get the identity point
+                    if R != 0:
+                        return Point(None, None)
+                    return self.double()
+                # Otherwise, the secant has slope R / (H Z1 Z2), and the
+                # three x values where it meets the curve sum to m^2-a
+                Z3 = H * self.Z * other.Z
+                H2 = H * H
+                X3 = R * R - a * Z3 * Z3 - (U1 + U2) * H2
+                Y3 = R * (U1 * H2 - X3) - S1 * H2 * H
+                return Point._make(X3, Y3, Z3)
+
+            def __sub__(self, other):
+                return self + -other
+
+            def __mul__(self, other):
+                """Multiply by an integer, by successive doubling"""
+                if other < 0:
+                    return (-self) * -other
+                result = Point(None, None)
+                for bit in bin(other)[2:]:
+                    result = result.double()
+                    if bit == "1":
+                        result = result + self
+                return result.reduced()
+
+            def __rmul__(self, other):
+                """Multiply by an integer, by successive doubling"""
+                return self * other
+
+            def __repr__(self):
+                return "<point>(%s, %s)" % (repr(self.x), repr(self.y))
+
+            def __str__(self):
+                return "(%s, %s)" % (self.x, self.y)
+
+        self.point = Point
+
+    def __str__(self):
+        s = "y^2 = x^3"
+        if self.a != 0:
+            s += f" + {self.a} x^2"
+        if self.b != 0:
+            s += f" + {self.b} x"
+        if self.c != 0:
+            s += f" + {self.c}"
+        return s
+
+    def __repr__(self):
+        return f"EllipticCurve({self.a}, {self.b}, {self.c})"
+
+    @cached(when=lambda self, p: p > POINT_COUNT_CACHE_MIN)
+    def count_solutions_mod_p(self, p):
+        """Count the number of solutions to this elliptic curve modulo p"""
+        count = 0
+        for x in range(p):
+            l = jacobi(x ** 3 + self.a * x ** 2 + self.b * x + self.c, p)
+            count += l + 1
+        return count
+
+    def list_solutions_mod_p(self, p):
+        """List the solutions to this elliptic curve modulo a prime p"""
+        field = ModularIntegers(p)
+        sols = []
+        for x in range(p):
+            y = sqrt_mod_prime(x ** 3 + self.a * x ** 2 + self.b * x + self.c, p)
+            if y is None:
+                continue
+            for root in sorted({y, -y % p}):
+                sols.append((field(x), field(root)))
+        return sols
+
+    def search_points(self, height):
+        """List the rational points (other than infinity) with x = u/w^2 in
+        lowest terms for |u| <= height and w^2 <= height, in the manner of
+        ratpoints, for a curve with integer coefficients
+
+        These are where v^2 = u^3 + au^2w^2 + buw^4 + cw^6 has an integer
+        solution. For each w, the u which could work are kept as the set
+        bits of one large integer, which is ANDed with the repeated pattern
+        of the residues of u making the right hand side a square modulo each
+        of `SIEVE_MODULI`. Only the few u left are checked exactly.
+        """
+        a, b, c = self.a, self.b, self.c
+        assert all(type(k) is int for k in (a, b, c)), "Need integer coefficients"
+        # Bit i stands for u = i - height
+        length = 2 * height + 1
+        squares = {m: {i * i % m for i in range(m)} for m in SIEVE_MODULI}
+        patterns = {}
+        points = []
+        for w in range(1, isqrt(height) + 1):
+            w2 = w * w
+            w4 = w2 * w2
+            w6 = w4 * w2
+            candidates = (1 << length) - 1
+            for m in SIEVE_MODULI:
+                pattern = patterns.get((m, w % m))
+                if pattern is None:
+                    pattern = 0
+                    for i in range(m):
+                        u = i - height
+                        f = ((u + a * w2) * u + b * w4) * u + c * w6
+                        if f % m in squares[m]:
+                            pattern |= 1 << i
+                    patterns[m, w % m] = pattern
+                candidates &= _repeat_bits(pattern, m, length)
+            # Reversed, so the character at index i is bit i
+            bits = bin(candidates)[:1:-1]
+            i = bits.find("1")
+            while i >= 0:
+                u = i - height
+                if gcd(u, w) == 1:
+                    f = ((u + a * w2) * u + b * w4) * u + c * w6
+                    v = isqrt(f) if f >= 0 else -1
+                    if v * v == f:
+                        points.append(self.point._make(u, v, w))
+                        if v != 0:
+                            points.append(self.point._make(u, -v, w))
+                i = bits.find("1", i + 1)
+        return points
+
+
+def output_nonzero_p_defects(curve, stop, store=None):
+    """Output the primes up to stop with a nonzero defect, reading them from
+    a `primestore.PrimeStore` if one is passed in"""
+    from .prime import eratosthenes
+
+    primes = eratosthenes(stop) if store is None else store.primes_between(2, stop + 1)
+    print("\\begin{ttabular}")
+    for p in primes:
+        defect = curve.count_solutions_mod_p(p) - p
+        if defect != 0:
+            print(f"\\bfseries {p} & {defect} \\\\")
+    print("\\end{ttabular}")
@@ -0,0 +1,318 @@
+from . import tracing
+
+
+def print_euclidean(a, b):
+    while b != 0:
+        q, r = divmod(a, b)
+        print("{} &= {}\\times{} + {} \\\\".format(a, q, b, r), end="\n")
+        a, b = b, r
+
+
+def xgcd(a, b):
+    """Given integers a,b, return (g, x, y) such that a*x+b*y = g = gcd(a,b)"""
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b != 0:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        return -a, -x0, -y0
+    return a, x0, y0
+
+
+# Bits in the leading words used by Lehmer's algorithm
+LEHMER_WORD_BITS = 64
+# Operand sizes, in bits, from which each algorithm is the fastest, as
+# measured on random operands: Lehmer overtakes the plain loop at around
+# 2-4k bits, and half-GCD overtakes Lehmer at around 64k bits
+LEHMER_MIN_BITS = 3000
+HALF_GCD_MIN_BITS = 64000
+# Size below which the half-GCD recursion switches to plain Euclid steps
+HALF_GCD_BASE_BITS = 4000
+
+
+def lehmer_xgcd(a, b):
+    """Given integers a,b, return (g, x, y) such that a*x+b*y = g = gcd(a,b)
+
+    Uses Lehmer's algorithm, which works out runs of quotients from the
+    leading words of the operands and applies them all at once.
+    """
+    sa, sb = (-1 if a < 0 else 1), (-1 if b < 0 else 1)
+    a, b = abs(a), abs(b)
+    if a < b:
+        g, y, x = lehmer_xgcd(b, a)
+        return g, sa * x, sb * y
+    u, v = a, b
+    # Coefficients on a of u and v
+    ux, vx = 1, 0
+    while v.bit_length() > LEHMER_WORD_BITS:
+        shift = u.bit_length() - LEHMER_WORD_BITS
+        uh, vh = u >> shift, v >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while vh + C != 0 and vh + D != 0:
+            q = (uh + A) // (vh + C)
+            if q != (uh + B) // (vh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            uh, vh = vh, uh - q * vh
+        if B == 0:
+            q, r = divmod(u, v)
+            u, v = v, r
+            ux, vx = vx, ux - q * vx
+        else:
+            u, v = A * u + B * v, C * u + D * v
+            ux, vx = A * ux + B * vx, C * ux + D * vx
+    g, x, y = xgcd(u, v)
+    x = x * ux + y * vx
+    y = (g - a * x) // b if b != 0 else 0
+    return g, sa * x, sb * y
+
+
+def _matrix_mul(m1, m2):
+    """Multiply 2x2 matrices, given as tuples (p, q, r, s) of rows"""
+    p1, q1, r1, s1 = m1
+    p2, q2, r2, s2 = m2
+    return (
+        p1 * p2 + q1 * r2,
+        p1 * q2 + q1 * s2,
+        r1 * p2 + s1 * r2,
+        r1 * q2 + s1 * s2,
+    )
+
+
+def _apply_inverse(m, a, b):
+    """Given a unimodular matrix m with (a, b) = m (a', b'), return
+    (m', a', b') with a' >= b' >= 0, adjusting m to keep (a, b) = m' (a', b')"""
+    p, q, r, s = m
+    det = p * s - q * r
+    a, b = det * (s * a - q * b), det * (p * b - r * a)
+    if a < 0:
+        a, p, r = -a, -p, -r
+    if b < 0:
+        b, q, s = -b, -q, -s
+    if a < b:
+        a, b, p, q, r, s = b, a, q, p, s, r
+    return (p, q, r, s), a, b
+
+
+def _half_gcd(a, b):
+    """Given a >= b >= 0, find a unimodular matrix m and a' >= b' >= 0 of
+    about half the size of a such that (a, b) = m (a', b')
+
+    The matrix is worked out recursively from the leading halves of a and b,
+    and any quotients which the truncation gets wrong are absorbed by
+    keeping a', b' non-negative, so the result is exact regardless.
+    """
+    half = a.bit_length() // 2
+    m = (1, 0, 0, 1)
+    if b.bit_length() <= half:
+        return m, a, b
+    if a.bit_length() < HALF_GCD_BASE_BITS:
+        while b.bit_length() > half:
+            q, r = divmod(a, b)
+            a, b = b, r
+            m = (m[0] * q + m[1], m[0], m[2] * q + m[3], m[2])
+        return m, a, b
+    m, _, _ = _half_gcd(a >> half, b >> half)
+    m, a, b = _apply_inverse(m, a, b)
+    if b.bit_length() <= half:
+        return m, a, b
+    q, r = divmod(a, b)
+    a, b = b, r
+    m = (m[0] * q + m[1], m[0], m[2] * q + m[3], m[2])
+    if b.bit_length() <= half:
+        return m, a, b
+    shift = max(2 * half - a.bit_length(), 0)
+    m2, _, _ = _half_gcd(a >> shift, b >> shift)
+    m2, a, b = _apply_inverse(m2, a, b)
+    return _matrix_mul(m, m2), a, b
+
+
+def half_gcd_xgcd(a, b):
+    """Given integers a,b, return (g, x, y) such that a*x+b*y = g = gcd(a,b)
+
+    Uses the subquadratic half-GCD algorithm until the operands are small
+    enough for Lehmer's algorithm.
+    """
+    sa, sb = (-1 if a < 0 else 1), (-1 if b < 0 else 1)
+    a, b = abs(a), abs(b)
+    if a < b:
+        g, y, x = half_gcd_xgcd(b, a)
+        return g, sa * x, sb * y
+    m = (1, 0, 0, 1)
+    u, v = a, b
+    while v.bit_length() >= HALF_GCD_MIN_BITS:
+        step, u, v = _half_gcd(u, v)
+        if step == (1, 0, 0, 1):
+            q, r = divmod(u, v)
+            u, v = v, r
+            step = (q, 1, 1, 0)
+        m = _matrix_mul(m, step)
+    g, x, y = lehmer_xgcd(u, v)
+    # (u, v) = m^-1 (a, b), so g = (x, y) m^-1 (a, b)
+    p, q, r, s = m
+    det = p * s - q * r
+    return g, sa * det * (x * s - y * r), sb * det * (y * p - x * q)
+
+
+tracing.register_latex(
+    {
+        "euclid.step": (
+            "{a} &= {q}\\times{b} + {r} & \\;\\;\\;\\; & "
+            "{r} &= {x}\\times{a0} &+ {y}\\times{b0} \\\\\n"
+        ),
+    }
+)
+
+
+def extended_euclidean(a, b, output=False):
+    """Given integers a,b, find integers x,y such that a*x+b*y = gcd(a,b)
+
+    The algorithm is picked by the size of the operands, unless the steps
+    are being traced.
+    """
+    if not output and not tracing.active():
+        bits = min(a.bit_length(), b.bit_length())
+        if bits < LEHMER_MIN_BITS:
+            return xgcd(a, b)[1:]
+        elif bits < HALF_GCD_MIN_BITS:
+            return lehmer_xgcd(a, b)[1:]
+        else:
+            return half_gcd_xgcd(a, b)[1:]
+    with tracing.latex_output(output):
+        og_a = a
+        og_b = b
+        x0, x1, y0, y1 = 1, 0, 0, 1
+        while b != 0:
+            q, r = divmod(a, b)
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+            tracing.emit(
+                "euclid.step", a=a, q=q, b=b, r=r, x=x1, a0=og_a, y=y1, b0=og_b
+            )
+            a, b = b, r
+        if a < 0:
+            return -x0, -y0
+        return x0, y0
+
+
+def inverse(a, m):
+    """Compute the inverse of a modulo m, raising an error if a is not a unit"""
+    g, x, _ = xgcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"{a} does not have an inverse modulo {m}")
+    return x % m
+
+
+def inverse_many(values, m):
+    """Compute the inverses of all the values modulo m, raising an error if
+    any of them is not a unit
+
+    Uses Montgomery's trick, so only one inversion is performed.
+    """
+    values = [v % m for v in values]
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % m
+    g, inv, _ = xgcd(acc, m)
+    if g != 1:
+        for v in values:
+            if xgcd(v, m)[0] != 1:
+                raise ValueError(f"{v} does not have an inverse modulo {m}")
+    inv %= m
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inv * prefix[i] % m
+        inv = inv * values[i] % m
+    return inverses
+
+
+def product_tree(values):
+    """Build the tree of products of the values, as a list of levels with
+    the values themselves first and their product last"""
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append(
+            [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+            + ([level[-1]] if len(level) % 2 == 1 else [])
+        )
+    return tree
+
+
+def remainder_tree(n, tree):
+    """Compute n mod each of the leaves of a product tree"""
+    remainders = [n % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % v for (i, v) in enumerate(level)]
+    return remainders
+
+
+class CRTBasis:
+    """Precomputed data for the Chinese Remainder Theorem over a fixed list
+    of pairwise coprime moduli"""
+
+    def __init__(self, moduli):
+        assert len(moduli) > 0, "Must have at least one modulus"
+        self.moduli = list(moduli)
+        self._tree = product_tree(self.moduli)
+        self.modulus = self._tree[-1][0]
+        # (M/m_i) mod m_i, from M mod m_i^2
+        squares = product_tree([m * m for m in self.moduli])
+        cofactors = [
+            (r // m) % m
+            for (r, m) in zip(remainder_tree(self.modulus, squares), self.moduli)
+        ]
+        try:
+            self._weights = [inverse(c, m) for (c, m) in zip(cofactors, self.moduli)]
+        except ValueError:
+            raise ValueError("Moduli must be pairwise coprime")
+
+    def reconstruct(self, residues):
+        """Find the unique x modulo the product of the moduli such that
+        x is congruent to each residue modulo the corresponding modulus"""
+        assert len(residues) == len(self.moduli), "Need one residue per modulus"
+        values = [
+            r * w % m for (r, w, m) in zip(residues, self._weights, self.moduli)
+        ]
+        for level in self._tree[:-1]:
+            values = [
+                values[i] * level[i + 1] + values[i + 1] * level[i]
+                for i in range(0, len(level) - 1, 2)
+            ] + ([values[-1]] if len(level) % 2 == 1 else [])
+        return values[0] % self.modulus
+
+    def reconstruct_many(self, residue_lists):
+        """Reconstruct each of a list of lists of residues"""
+        return [self.reconstruct(residues) for residues in residue_lists]
+
+
+def crt_many(residues, moduli):
+    """Find the unique x modulo the product of the pairwise coprime moduli
+    such that x is congruent to each residue modulo the corresponding
+    modulus"""
+    return CRTBasis(moduli).reconstruct(residues)
+
+
+def print_lightningbolt(a, b):
+    coeffs = []
+    while b != 0:
+        q, r = divmod(a, b)
+        print("{} &= {}\\times{} + {} \\\\".format(a, q, b, r), end="\n")
+        a, b = b, r
+        coeffs.append(q)
+    row1 = [0, 1]
+    row2 = [1, 0]
+    for coeff in coeffs:
+        row1.append(row1[-2] + row1[-1] * coeff)
+        row2.append(row2[-2] + row2[-1] * coeff)
+    print("\\begin{tabular}{ c c|%s }" % " ".join(["c"] * len(coeffs)))
+    print("\\hline")
+    print("&&" + " & ".join(map(str, coeffs)) + "\\\\")
+    print(" & ".join(map(str, row1)) + "\\\\")
+    print(" & ".join(map(str, row2)))
+    print("\\end{tabular}")
@@ -0,0 +1,247 @@
+from collections import Counter
+from math import isqrt
+
+from .prime import eratosthenes, prime_factor
+from .sqrtmod import cornacchia, sqrt_mod_prime
+
+
+class GaussianInteger:
+    """A class representing the Gaussian integers a + bi"""
+
+    __slots__ = ("re", "im")
+
+    def __init__(self, re, im=0):
+        self.re = re
+        self.im = im
+
+    @classmethod
+    def _of(cls, value):
+        if type(value) is cls:
+            return value
+        elif type(value) is int:
+            return cls(value)
+        return None
+
+    # Ring operations
+
+    def __add__(self, other):
+        other = GaussianInteger._of(other)
+        if other is None:
+            return NotImplemented
+        return GaussianInteger(self.re + other.re, self.im + other.im)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = GaussianInteger._of(other)
+        if other is None:
+            return NotImplemented
+        return GaussianInteger(self.re - other.re, self.im - other.im)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        return GaussianInteger(-self.re, -self.im)
+
+    def __mul__(self, other):
+        other = GaussianInteger._of(other)
+        if other is None:
+            return NotImplemented
+        return GaussianInteger(
+            self.re * other.re - self.im * other.im,
+            self.re * other.im + self.im * other.re,
+        )
+
+    __rmul__ = __mul__
+
+    def __pow__(self, p):
+        value = GaussianInteger(1)
+        step = self
+        while p > 0:
+            if p & 1:
+                value *= step
+            step *= step
+            p >>= 1
+        return value
+
+    def __divmod__(self, other):
+        """Divide with remainder, rounding the quotient to the nearest
+        Gaussian integer so the remainder has smaller norm than other"""
+        other = GaussianInteger._of(other)
+        if other is None:
+            return NotImplemented
+        n = other.norm()
+        num = self * other.conjugate()
+        q = GaussianInteger((2 * num.re + n) // (2 * n), (2 * num.im + n) // (2 * n))
+        return q, self - q * other
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __eq__(self, other):
+        other = GaussianInteger._of(other)
+        if other is None:
+            return NotImplemented
+        return self.re == other.re and self.im == other.im
+
+    def __hash__(self):
+        return hash((self.re, self.im))
+
+    def conjugate(self):
+        """Get the complex conjugate"""
+        return GaussianInteger(self.re, -self.im)
+
+    def norm(self):
+        """Get the norm, a^2 + b^2"""
+        return self.re * self.re + self.im * self.im
+
+    def associates(self):
+        """Get the four associates of this value, including itself"""
+        return [
+            self,
+            GaussianInteger(-self.im, self.re),
+            GaussianInteger(-self.re, -self.im),
+            GaussianInteger(self.im, -self.re),
+        ]
+
+    def normalized(self):
+        """Get the associate with positive real part and non-negative
+        imaginary part (or 0)"""
+        for z in self.associates():
+            if z.re > 0 and z.im >= 0:
+                return z
+        return self
+
+    # Display control
+
+    def __str__(self):
+        if self.im == 0:
+            return str(self.re)
+        elif self.re == 0:
+            return f"{self.im}i"
+        return f"{self.re}{'+' if self.im > 0 else '-'}{abs(self.im)}i"
+
+    def __repr__(self):
+        return f"GaussianInteger({self.re}, {self.im})"
+
+
+def gaussian_gcd(a, b):
+    """Compute a greatest common divisor of two Gaussian integers, normalized
+    to have positive real part and non-negative imaginary part"""
+    a, b = GaussianInteger._of(a), GaussianInteger._of(b)
+    while b != 0:
+        a, b = b, a % b
+    return a.normalized() if a != 0 else a
+
+
+def split_prime(p):
+    """Find the Gaussian prime a + bi with a > b > 0 over a prime p = 1 (mod 4)"""
+    a, b = cornacchia(p, root=sqrt_mod_prime(-1, p))
+    return GaussianInteger(max(a, b), min(a, b))
+
+
+def gaussian_factor(n, factors=None):
+    """Factor a positive integer n into Gaussian primes, returning a unit and
+    a dictionary mapping each prime to its exponent
+
+    The rational prime factors of n can be passed in if already known.
+    """
+    if factors is None:
+        factors = prime_factor(n)
+    unit = GaussianInteger(1)
+    primes = {}
+    for p, e in Counter(factors).items():
+        if p == 2:
+            # 2 = -i (1+i)^2
+            primes[GaussianInteger(1, 1)] = 2 * e
+            unit *= GaussianInteger(0, -1) ** e
+        elif p % 4 == 3:
+            primes[GaussianInteger(p)] = e
+        else:
+            pi = split_prime(p)
+            pi_bar = pi.conjugate().normalized()
+            primes[pi] = e
+            primes[pi_bar] = e
+            unit *= (pi.conjugate() // pi_bar) ** e
+    return unit, primes
+
+
+def sums_of_two_squares(n, factors=None):
+    """Find every way of writing n = a^2 + b^2 with 0 <= a <= b
+
+    The rational prime factors of n can be passed in if already known.
+    """
+    if n == 0:
+        return [(0, 0)]
+    if factors is None:
+        factors = prime_factor(n)
+    base = GaussianInteger(1)
+    choices = [GaussianInteger(1)]
+    for p, e in Counter(factors).items():
+        if p == 2:
+            base *= GaussianInteger(1, 1) ** e
+        elif p % 4 == 3:
+            if e % 2 == 1:
+                return []
+            base *= p ** (e // 2)
+        else:
+            pi = split_prime(p)
+            pi_bar = pi.conjugate()
+            powers = [pi ** k * pi_bar ** (e - k) for k in range(e + 1)]
+            choices = [c * q for c in choices for q in powers]
+    found = set()
+    for c in choices:
+        z = base * c
+        a, b = abs(z.re), abs(z.im)
+        found.add((min(a, b), max(a, b)))
+    return sorted(found)
+
+
+def r2(n):
+    """Count the ways of writing n = a^2 + b^2 with a, b integers (so with
+    order and signs counted)"""
+    if n == 0:
+        return 1
+    count = 4
+    for p, e in Counter(prime_factor(n)).items():
+        if p % 4 == 1:
+            count *= e + 1
+        elif p % 4 == 3 and e % 2 == 1:
+            return 0
+    return count
+
+
+def r2_range(lo, hi):
+    """Compute r2(n) for every n in range(lo, hi) by sieving by the primes
+    up to sqrt(hi), rather than factoring each n"""
+    assert 0 <= lo <= hi, "Must be a range of non-negative integers"
+    size = hi - lo
+    rest = list(range(lo, hi))
+    counts = [4] * size
+    for p in eratosthenes(isqrt(max(hi - 1, 0))):
+        for i in range((-lo) % p, size, p):
+            if rest[i] == 0:
+                continue
+            e = 0
+            while rest[i] % p == 0:
+                rest[i] //= p
+                e += 1
+            if p % 4 == 1:
+                counts[i] *= e + 1
+            elif p % 4 == 3 and e % 2 == 1:
+                counts[i] = 0
+    for i in range(size):
+        # Anything left over is a single prime above sqrt(hi)
+        if rest[i] == 0:
+            counts[i] = 1
+        elif rest[i] == 1:
+            continue
+        elif rest[i] % 4 == 1:
+            counts[i] *= 2
+        elif rest[i] % 4 == 3:
+            counts[i] = 0
+    return counts
@@ -1,3 +1,8 @@
+from . import characters
+from .interning import interned_factory
+
+
+@interned_factory()
 def GroupRing(R, G):
     """Returns the group ring associated with R and G
 
@@ -11,6 +16,8 @@ def GroupRing(R, G):
     class Ring:
         f"The group ring {R}{G}"
 
+        __slots__ = ("_values",)
+
         # Construct values in the ring
 
         def __init__(self, value):
@@ -119,6 +126,47 @@ def GroupRing(R, G):
         def norm_squared(self):
             return sum(abs(r) ** 2 for r in self._values)
 
+        # Class functions and characters
+
+        def _class_sums(self):
+            """Sum the coefficients over each conjugacy class"""
+            sums = [R(0) for _ in characters.conjugacy_classes(G)]
+            for value, c in zip(self._values, characters.class_indices(G)):
+                sums[c] += value
+            return sums
+
+        @classmethod
+        def get_characters(cls):
+            """Returns the irreducible characters of the group, as elements of
+            the group ring, from the group's cached character table"""
+            indices = characters.class_indices(G)
+            return [
+                cls([row[c] for c in indices])
+                for row in characters.character_table(G)
+            ]
+
+        def class_function_projection(self):
+            """Project onto the class functions, which are the center of the
+            group ring, by averaging the coefficients over each conjugacy
+            class (R must contain the averages, as complex does)"""
+            classes = characters.conjugacy_classes(G)
+            averages = [s / len(c) for s, c in zip(self._class_sums(), classes)]
+            return Ring([averages[c] for c in characters.class_indices(G)])
+
+        def character_coefficients(self):
+            """Get the inner product with each irreducible character, over
+            the order of the group, which for a class function gives its
+            coefficients in terms of the characters
+
+            This is the conjugated character table times the class sums.
+            """
+            sums = self._class_sums()
+            n = G.get_group_order()
+            return [
+                sum(s * complex(x).conjugate() for s, x in zip(sums, row)) / n
+                for row in characters.character_table(G)
+            ]
+
         # Represent as strings
 
         def __str__(self):
@@ -0,0 +1,147 @@
+# Algorithms which work in any group following the interface in groups.py:
+# <group>.e is the identity, and elements support *, ** (by non-negative
+# integers) and multiplicative_inverse()
+
+import math
+from collections import Counter
+
+from .euclid import crt_many
+from .prime import prime_factor
+
+
+def element_key(x):
+    """Get a hashable key for a group element, which is the element itself
+    when it is hashable"""
+    try:
+        hash(x)
+        return x
+    except TypeError:
+        return repr(x)
+
+
+def element_order(x, multiple=None, factors=None):
+    """Compute the order of x, given a multiple of it (by default the order
+    of the group) and optionally the prime factors of that multiple
+
+    Works down from the multiple one prime at a time, so it needs only a
+    few exponentiations per prime factor.
+    """
+    if multiple is None:
+        multiple = type(x).get_group_order()
+    if factors is None:
+        factors = prime_factor(multiple)
+    e = type(x).e
+    order = multiple
+    for q, k in Counter(factors).items():
+        for _ in range(k):
+            if x ** (order // q) != e:
+                break
+            order //= q
+    return order
+
+
+def babystep_giantstep(g, h, order=None):
+    """Solve g^k = h for 0 <= k < order, where order is a multiple of the
+    order of g (by default the order of the group), or return None"""
+    if order is None:
+        order = type(g).get_group_order()
+    m = math.isqrt(order - 1) + 1 if order > 1 else 1
+    steps = {}
+    power = type(g).e
+    for j in range(m):
+        steps.setdefault(element_key(power), j)
+        power = power * g
+    giant = (g ** m).multiplicative_inverse()
+    probe = h
+    for i in range(m):
+        j = steps.get(element_key(probe))
+        if j is not None:
+            return i * m + j
+        probe = probe * giant
+    return None
+
+
+# Walks pollard_rho_log tries before deciding h is not a power of g
+RHO_RESTARTS = 16
+
+
+def pollard_rho_log(g, h, q):
+    """Solve g^k = h for 0 <= k < q, where g has prime order q, or return
+    None, using Pollard's rho with Floyd cycle finding
+
+    Elements are put in three classes by the hash of their key, so this
+    needs hashable (or consistently printable) elements.
+    """
+    e = type(g).e
+    if h == e:
+        return 0
+    if h ** q != e:
+        # h is not in any subgroup of order q, so not in the one g makes
+        return None
+
+    def step(x, a, b):
+        c = hash(element_key(x)) % 3
+        if c == 0:
+            return x * g, (a + 1) % q, b
+        elif c == 1:
+            return x * h, a, (b + 1) % q
+        else:
+            return x * x, 2 * a % q, 2 * b % q
+
+    # Each start either finds k or makes a useless collision, which is rare
+    # unless h is outside <g> (in another subgroup of order q)
+    for start in range(1, min(q, RHO_RESTARTS) + 1):
+        # x = g^a h^b for both the tortoise and the hare
+        x, a, b = g ** start, start % q, 0
+        y, c, d = x, a, b
+        while True:
+            x, a, b = step(x, a, b)
+            y, c, d = step(*step(y, c, d))
+            if x == y:
+                break
+        if (d - b) % q == 0:
+            # Useless collision, so try again from another start
+            continue
+        k = (a - c) * pow(d - b, -1, q) % q
+        if g ** k == h:
+            return k
+    return None
+
+
+# Prime subgroups at least this large are solved by rho instead of BSGS
+RHO_MIN_ORDER = 2 ** 20
+
+
+def discrete_log(g, h, order=None, factors=None):
+    """Solve g^k = h for 0 <= k < ord(g), or return None
+
+    Uses Pohlig-Hellman on the order of g (found from the order of the
+    group by default), solving in each prime-order subgroup by baby-step
+    giant-step or, for large subgroups, by Pollard's rho.
+    """
+    if order is None:
+        order = element_order(g, factors=factors)
+        factors = None
+    if factors is None:
+        factors = prime_factor(order)
+    e = type(g).e
+    residues, moduli = [], []
+    for q, k in Counter(factors).items():
+        gamma = g ** (order // q)
+        x = 0
+        for i in range(k):
+            # Strip off the digits found so far, and project to order q
+            target = (h * (g ** x).multiplicative_inverse()) ** (order // q ** (i + 1))
+            if q >= RHO_MIN_ORDER:
+                digit = pollard_rho_log(gamma, target, q)
+            else:
+                digit = babystep_giantstep(gamma, target, q)
+            if digit is None:
+                return None
+            x += digit * q ** i
+        residues.append(x)
+        moduli.append(q ** k)
+    if not moduli:
+        return 0 if h == e else None
+    k = crt_many(residues, moduli)
+    return k if g ** k == h else None
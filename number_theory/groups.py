@@ -0,0 +1,421 @@
+# Group interface: methods provided on groups in here
+# and <group>.e should be identity
+
+import cmath
+import itertools
+import math
+
+from .interning import interned_factory
+
+# Cyclic groups up to this order share one object per element
+INTERN_LIMIT = 1024
+
+
+@interned_factory()
+def CyclicGroup(n):
+    """Produce the cyclic group of order n"""
+    assert n > 0, "Must have positive order"
+
+    interned = [None] * n if n <= INTERN_LIMIT else None
+
+    class Cyclic:
+        f"The cyclic group of order {n}"
+
+        __slots__ = ("_a",)
+
+        # Functions to make one
+
+        def __new__(cls, a):
+            a %= n
+            if interned is not None:
+                value = interned[a]
+                if value is None:
+                    value = object.__new__(cls)
+                    value._a = a
+                    interned[a] = value
+                return value
+            value = object.__new__(cls)
+            value._a = a
+            return value
+
+        @classmethod
+        def natural_project_from(cls, value):
+            """Perform the natural projection into this dihedral group from the dihedral group the value is in"""
+            m = n // value.get_order()
+            if m * value.get_order() != n:
+                raise TypeError(f"{value} is not from a subgroup of {cls.__doc__}")
+            return Cyclic(value._a * m)
+
+        @classmethod
+        def __iter__(self):
+            def iterate():
+                for a in range(n):
+                    yield Cyclic(a)
+
+            return iterate()
+
+        # Group-theoretic manipulations
+
+        def __mul__(self, other):
+            try:
+                return Cyclic(self._a + other._a)
+            except AttributeError:
+                return NotImplemented
+
+        def __truediv__(self, other):
+            try:
+                return self * other.multiplicative_inverse()
+            except AttributeError:
+                return NotImplemented
+
+        def __pow__(self, p):
+            try:
+                return Cyclic(self._a * p)
+            except AttributeError:
+                return NotImplemented
+
+        def __eq__(self, other):
+            return self._a == other._a and n == other.get_order()
+
+        def __hash__(self):
+            return hash((n, self._a))
+
+        def multiplicative_inverse(self):
+            """Compute the multiplicative inverse"""
+            return Cyclic(-self._a)
+
+        # Display control
+
+        def __str__(self):
+            if self._a == 0:
+                return "1"
+            else:
+                return "x^{{%s}}" % self._a
+
+        def __repr__(self):
+            return f"CyclicGroup({n})({self._a})"
+
+        # Type-level manipulations
+
+        @classmethod
+        def get_order(cls):
+            """Get the order of this group"""
+            return n
+
+        @classmethod
+        def get_group_order(cls):
+            """Get the number of elements in this group"""
+            return n
+
+        @classmethod
+        def get_conjugacy_classes(cls):
+            """List the conjugacy classes, which are single elements since
+            the group is abelian"""
+            return [[g] for g in cls.__iter__()]
+
+        @classmethod
+        def get_character_table(cls):
+            """List the irreducible characters, where the jth maps x^k to
+            exp(2 pi i jk / n), on the classes in order"""
+            # The nth roots of unity, exact where they are 1, i, -1 or -i
+            roots = [
+                (1, 1j, -1, -1j)[4 * r // n]
+                if 4 * r % n == 0
+                else cmath.exp(2j * math.pi * r / n)
+                for r in range(n)
+            ]
+            return [[roots[j * k % n] for k in range(n)] for j in range(n)]
+
+    Cyclic.e = Cyclic(0)
+    Cyclic.x = Cyclic(1)
+
+    return Cyclic
+
+
+@interned_factory()
+def DihedralGroup(n):
+    """Get the dihedral group of order n"""
+    assert n % 2 == 0 and n > 0, "Dihedral groups must have positive, even order"
+
+    class Dihedral:
+        f"The dihedral group of order {n}"
+
+        __slots__ = ("_s", "_r")
+
+        # Functions to make one
+
+        def __init__(self, s, r):
+            self._s = s % 2
+            self._r = r % (n // 2)
+
+        @classmethod
+        def natural_project_from(cls, value):
+            """Perform the natural projection into this dihedral group from the dihedral group the value is in"""
+            m = n // value.get_order()
+            if m * value.get_order() != n:
+                raise TypeError(f"{value} is not from a subgroup of {cls.__doc__}")
+            return Dihedral(value._s, value._r * m)
+
+        @classmethod
+        def __iter__(self):
+            def iterate():
+                for g in range(n):
+                    yield Dihedral(g // (n // 2), g % (n // 2))
+
+            return iterate()
+
+        # Group-theoretic manipulations
+
+        def __mul__(self, other):
+            try:
+                if other._s == 0:
+                    return Dihedral(self._s, self._r + other._r)
+                else:
+                    return Dihedral(self._s + 1, -self._r + other._r)
+            except AttributeError:
+                return NotImplemented
+
+        def __truediv__(self, other):
+            try:
+                return self * other.multiplicative_inverse()
+            except AttributeError:
+                return NotImplemented
+
+        def __pow__(self, p):
+            try:
+                if self._s == 0:
+                    return Dihedral(0, self._r * p)
+                else:
+                    if p % 2 == 0:
+                        return Dihedral(0, 0)
+                    else:
+                        return self
+            except AttributeError:
+                return NotImplemented
+
+        def __eq__(self, other):
+            return (
+                self._s == other._s and self._r == other._r and n == other.get_order()
+            )
+
+        def __hash__(self):
+            return hash((n, self._s, self._r))
+
+        def multiplicative_inverse(self):
+            """Compute the multiplicative inverse, raising an error if this value is not a unit"""
+            if self._s == 0:
+                return Dihedral(0, -self._r)
+            else:
+                return self
+
+        # Display control
+
+        def __str__(self):
+            s = "s" if self._s else ""
+            if self._r == 0:
+                r = ""
+            elif self._r == 1:
+                r = "r"
+            else:
+                r = f"r^{self._r}"
+            return (s + r) or "e"
+
+        def __repr__(self):
+            return f"DihedralGroup({n})({self._s}, {self._r})"
+
+        # Type-level manipulations
+
+        @classmethod
+        def get_order(cls):
+            """Get the modulus for this ring"""
+            return n
+
+        @classmethod
+        def get_group_order(cls):
+            """Get the number of elements in this group"""
+            return n
+
+        @classmethod
+        def get_conjugacy_classes(cls):
+            """List the conjugacy classes, in the order of their first
+            elements
+
+            With m = n/2 rotations, these are {r^k, r^-k}, then every
+            reflection if m is odd, or else sr^k for even and for odd k.
+            """
+            m = n // 2
+            classes = [[Dihedral(0, k)] for k in range(m // 2 + 1)]
+            for k, rotations in enumerate(classes):
+                if 2 * k % m != 0:
+                    rotations.append(Dihedral(0, -k))
+            if m % 2 == 1:
+                classes.append([Dihedral(1, k) for k in range(m)])
+            else:
+                classes.append([Dihedral(1, k) for k in range(0, m, 2)])
+                classes.append([Dihedral(1, k) for k in range(1, m, 2)])
+            return classes
+
+    Dihedral.e = Dihedral(0, 0)
+    Dihedral.s = Dihedral(1, 0)
+    Dihedral.r = Dihedral(0, 1)
+
+    return Dihedral
+
+
+@interned_factory()
+def SymmetricGroup(n):
+    """Get the symmetric group of order n"""
+    assert n > 0, "Symmetric groups must have positive order"
+
+    class Symmetric:
+        f"The symmetric group of order {n}"
+
+        __slots__ = ("_values",)
+
+        # Functions to make one
+
+        def __init__(self, values, check=True):
+            """Make a symmetric group from a list of where the numbers 1 through n go
+
+            If check is True, check that this list is a valid permutation
+            """
+            if check:
+                assert len(values) == n and set(values) == set(
+                    [i for i in range(1, n + 1)]
+                )
+            self._values = values
+
+        @classmethod
+        def natural_project_from(cls, value):
+            """Perform the natural projection into this symmetric group from the symmetric group the value is in"""
+            if value.get_order() > n:
+                raise TypeError(f"{value} is not from a subgroup of {cls.__doc__}")
+            return cls.cycle(*value.get_cycles())
+
+        @classmethod
+        def transpose(cls, a, b):
+            """Produce the transposition of the given two elements"""
+            return cls.cycle([a, b])
+
+        @classmethod
+        def cycle(cls, *cycles):
+            """Produce the transposition which contains the given
+            cycles, and fixes elements not in the cycles
+
+            May result in nonsense if cycles are not valid or if they
+            are overlapping.
+            """
+            values = [i for i in range(1, n + 1)]
+            for cycle in cycles:
+                for i in range(len(cycle)):
+                    values[cycle[i] - 1] = cycle[(i + 1) % len(cycle)]
+            return Symmetric(values)
+
+        @classmethod
+        def __iter__(cls):
+            return map(
+                lambda x: cls(list(x)),
+                itertools.permutations([i for i in range(1, n + 1)]),
+            )
+
+        # Group-theoretic manipulations
+
+        def __mul__(self, other):
+            try:
+                return Symmetric([self(other(i)) for i in range(1, n + 1)])
+            except AttributeError:
+                return NotImplemented
+
+        def __truediv__(self, other):
+            try:
+                return self * other.multiplicative_inverse()
+            except AttributeError:
+                return NotImplemented
+
+        def __pow__(self, p):
+            # Exponentiation by squaring
+            if p < 0:
+                return self.multiplicative_inverse() ** -p
+            value = Symmetric.e
+            step = self
+            while p > 0:
+                if p & 1 == 1:
+                    value *= step
+                step *= step
+                p >>= 1
+            return value
+
+        def __eq__(self, other):
+            return self._values == other._values and n == other.get_order()
+
+        def __hash__(self):
+            return hash((n, tuple(self._values)))
+
+        def multiplicative_inverse(self):
+            """Compute the multiplicative inverse, raising an error if this value is not a unit"""
+            values = [0 for _ in range(n)]
+            for i in range(1, n + 1):
+                values[self(i) - 1] = i
+            return Symmetric(values)
+
+        # Action on set of n points
+
+        def __call__(self, argument):
+            return self._values[argument - 1]
+
+        def get_cycles(self):
+            covered = [False] * (n + 1)
+            cycles = []
+            for i in range(1, n + 1):
+                if covered[i]:
+                    continue
+                cycle = []
+                while i not in cycle:
+                    cycle.append(i)
+                    covered[i] = True
+                    i = self(i)
+                cycles.append(cycle)
+            return cycles
+
+        def get_cycle_type(self):
+            """Get the lengths of the cycles, as a partition of n"""
+            return tuple(sorted(map(len, self.get_cycles()), reverse=True))
+
+        # Display control
+
+        def __str__(self):
+            cycles = [c for c in self.get_cycles() if len(c) > 1]
+            if cycles:
+                return " ".join(
+                    ("(" + " ".join(map(str, cycle)) + ")") for cycle in cycles
+                )
+            else:
+                return "e"
+
+        def __repr__(self):
+            return f"SymmetricGroup({n})({self._values})"
+
+        # Type-level manipulations
+
+        @classmethod
+        def get_order(cls):
+            """Get the order of this ring"""
+            return n
+
+        @classmethod
+        def get_group_order(cls):
+            """Get the number of elements in this group"""
+            return math.factorial(n)
+
+        @classmethod
+        def get_conjugacy_classes(cls):
+            """List the conjugacy classes, which are the permutations of each
+            cycle type, in the order of their first elements"""
+            classes = {}
+            for g in cls.__iter__():
+                classes.setdefault(g.get_cycle_type(), []).append(g)
+            return list(classes.values())
+
+    Symmetric.e = Symmetric([i for i in range(1, n + 1)])
+
+    return Symmetric
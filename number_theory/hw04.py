@@ -0,0 +1,59 @@
+from .euclid import crt_many, extended_euclidean
+from .modcontext import ModContext
+from .mullin import EuclidMullin
+
+
+def crt(b, m, c, n):
+    """Find the integer 0 <= x < mn such that:
+    - $$x \\equiv b (mod m)$$
+    - $$x \\equiv c (mod n)$$.
+    """
+    return crt_many([b, c], [m, n])
+
+
+def euclid_list(p, maximum=1000):
+    """Use the algorithm to produce a list of prime numbers, terminating
+    when the produced number has no factors below the given maximum and
+    is greater than the maximum.
+
+    The list passed in is left unchanged. See `mullin.EuclidMullin` to go
+    on past the maximum.
+    """
+    sequence = EuclidMullin(p, trial_bound=maximum - 1)
+    while True:
+        q = sequence.trial_factor()
+        if q is None:
+            return sequence.terms
+        sequence.append(q)
+
+
+def pow(a, k, m=None):
+    """Compute $$a^k$$ by the method of successive squaring
+
+    m may be an integer modulus or a `ModContext`.
+    """
+    if isinstance(m, ModContext):
+        b = 1
+        a %= m.m
+        while k >= 1:
+            if k & 1:
+                b = m.mul(b, a)
+            a = m.sqr(a)
+            k //= 2
+        return b % m.m
+    elif m is None:
+        b = 1
+        while k >= 1:
+            if k & 1:
+                b *= a
+            a **= 2
+            k //= 2
+        return b
+    else:
+        b = 1
+        while k >= 1:
+            if k & 1:
+                b = (b * a) % m
+            a = (a * a) % m
+            k //= 2
+        return b
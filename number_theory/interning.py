@@ -0,0 +1,44 @@
+import collections
+import functools
+import weakref
+
+
+def interned_factory(maxsize=32):
+    """Decorate a function which makes a class from hashable parameters so
+    that each set of parameters always gives back the same class
+
+    Classes are held weakly, so ones nothing refers to can be freed, and the
+    `maxsize` most recently requested are also held strongly so that
+    they are not rebuilt between uses.
+    """
+
+    def decorator(factory):
+        classes = weakref.WeakValueDictionary()
+        recent = collections.OrderedDict()
+
+        @functools.wraps(factory)
+        def get_class(*args):
+            cls = classes.get(args)
+            if cls is None:
+                cls = factory(*args)
+                classes[args] = cls
+            recent[args] = cls
+            recent.move_to_end(args)
+            if len(recent) > maxsize:
+                recent.popitem(last=False)
+            return cls
+
+        def cache_clear():
+            """Forget every class made so far"""
+            classes.clear()
+            recent.clear()
+
+        def classes_made():
+            """List the classes made so far which are still alive"""
+            return list(classes.values())
+
+        get_class.cache_clear = cache_clear
+        get_class.classes_made = classes_made
+        return get_class
+
+    return decorator
@@ -0,0 +1,254 @@
+import collections
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# Bytes of pickled results kept in each process's in-memory cache
+MEMORY_LIMIT = 64 * 2 ** 20
+
+# If set, the environment variable naming the SQLite file shared between
+# runs and processes; otherwise results are only cached in memory
+STORE_ENV = "NUMBER_THEORY_CACHE"
+
+# Seconds a writer waits for another process's write to finish
+SQLITE_TIMEOUT = 30
+
+
+def canonical(value):
+    """Encode a value as a string which is equal for equal arguments, for
+    ints, strings, None, bools, floats, tuples, lists, dicts and objects
+    with a meaningful repr"""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return f"{type(value).__name__}:{value!r}"
+    elif isinstance(value, (tuple, list)):
+        brackets = "()" if isinstance(value, tuple) else "[]"
+        return brackets[0] + ",".join(map(canonical, value)) + brackets[1]
+    elif isinstance(value, dict):
+        items = sorted((canonical(k), canonical(v)) for k, v in value.items())
+        return "{" + ",".join(f"{k}:{v}" for k, v in items) + "}"
+    text = repr(value)
+    if " at 0x" in text:
+        raise TypeError(f"Cannot make a cache key from {text}")
+    return f"{type(value).__qualname__}:{text}"
+
+
+class MemoryCache:
+    """A least recently used cache of pickled results, evicting the oldest
+    once their total size passes a limit
+
+    Each entry records the name of the function it is a result of, so the
+    results of one function can be dropped together.
+    """
+
+    def __init__(self, limit=MEMORY_LIMIT):
+        self.limit = limit
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get (data, expiry time) for a key, or None if it is not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[:2]
+
+    def put(self, key, function, data, expires):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            if len(data) > self.limit:
+                return
+            self._entries[key] = (data, expires, function)
+            self.size += len(data)
+            while self.size > self.limit:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def discard(self, function=None):
+        """Drop the results of one function, or everything"""
+        with self._lock:
+            if function is None:
+                self._entries.clear()
+                self.size = 0
+                return
+            for key, (data, _, owner) in list(self._entries.items()):
+                if owner == function:
+                    del self._entries[key]
+                    self.size -= len(data)
+
+
+class SQLiteStore:
+    """Pickled results in a SQLite file, which any number of processes can
+    read and write at once
+
+    Each process (and thread) opens its own connection, and the database is
+    in write-ahead logging mode so readers never wait for writers.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, function TEXT, data BLOB, "
+                "created REAL, expires REAL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS results_function ON results (function)"
+            )
+
+    def _connection(self):
+        # Connections must not be shared across a fork
+        if getattr(self._local, "pid", None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return self._local.db
+
+    def get(self, key):
+        """Get (data, expiry time) for a key, or None if it is not stored"""
+        row = (
+            self._connection()
+            .execute("SELECT data, expires FROM results WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return None if row is None else (row[0], row[1])
+
+    def put(self, key, function, data, expires):
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, function, data, time.time(), expires),
+            )
+
+    def discard(self, function=None):
+        """Delete the results of one function, or of every function"""
+        with self._connection() as db:
+            if function is None:
+                db.execute("DELETE FROM results")
+            else:
+                db.execute("DELETE FROM results WHERE function = ?", (function,))
+
+    def prune(self):
+        """Delete every expired result"""
+        with self._connection() as db:
+            db.execute(
+                "DELETE FROM results WHERE expires IS NOT NULL AND expires < ?",
+                (time.time(),),
+            )
+
+    def __repr__(self):
+        return f"SQLiteStore({self.path!r})"
+
+
+class ResultCache:
+    """An in-memory cache in front of an optional persistent store"""
+
+    def __init__(self, store=None, memory_limit=MEMORY_LIMIT):
+        self.memory = MemoryCache(memory_limit)
+        self.store = store
+
+    def get(self, key, function):
+        """Get the pickled result for a key of a function, or None if there
+        is no live one"""
+        entry = self.memory.get(key)
+        if entry is None and self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self.memory.put(key, function, *entry)
+        if entry is None:
+            return None
+        data, expires = entry
+        if expires is not None and expires < time.time():
+            return None
+        return data
+
+    def put(self, key, function, data, ttl=None):
+        expires = None if ttl is None else time.time() + ttl
+        self.memory.put(key, function, data, expires)
+        if self.store is not None:
+            self.store.put(key, function, data, expires)
+
+    def discard(self, function=None):
+        """Forget the results of one function, or of every function"""
+        self.memory.discard(function)
+        if self.store is not None:
+            self.store.discard(function)
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Get the cache used by functions which do not name their own, which
+    is backed by the SQLite file named by $NUMBER_THEORY_CACHE, if set"""
+    global _default_cache
+    if _default_cache is None:
+        path = os.environ.get(STORE_ENV)
+        _default_cache = ResultCache(SQLiteStore(path) if path else None)
+    return _default_cache
+
+
+def set_default_store(path):
+    """Back the default cache with a SQLite file, or with nothing if None"""
+    default_cache().store = None if path is None else SQLiteStore(path)
+
+
+def cached(version=0, ttl=None, when=None, cache=None):
+    """Decorate a pure function to cache its results, keyed by a hash of the
+    function's name, the version, and the canonical form of its arguments
+
+    Bump the version when the function's results change, so old results are
+    no longer found. Results expire after ttl seconds, if given. If `when`
+    is given, it is called with the arguments and only calls for which it
+    returns true are cached, so cheap calls skip the cache.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        def key_for(*args, **kwargs):
+            """Get the cache key for calling the function with these arguments"""
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            text = f"{name}:{version}:{canonical(bound.arguments)}"
+            return hashlib.sha256(text.encode()).hexdigest()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if when is not None and not when(*args, **kwargs):
+                return fn(*args, **kwargs)
+            results = cache or default_cache()
+            key = key_for(*args, **kwargs)
+            data = results.get(key, name)
+            if data is not None:
+                return pickle.loads(data)
+            value = fn(*args, **kwargs)
+            results.put(key, name, pickle.dumps(value), ttl)
+            return value
+
+        def invalidate():
+            """Forget every cached result of the function"""
+            (cache or default_cache()).discard(name)
+
+        wrapper.key_for = key_for
+        wrapper.invalidate = invalidate
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
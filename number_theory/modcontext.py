@@ -0,0 +1,132 @@
+import math
+
+# Below this many bits, CPython's own division is faster than Barrett
+# reduction done in Python, so the context defers to `%` and builtin pow
+BARRETT_MIN_BITS = 12000
+
+
+class ModContext:
+    """Precomputed constants for repeated arithmetic modulo a fixed m
+
+    Every modulus gets Barrett constants, which are used to reduce
+    products of residues once m is large enough for it to pay off.
+    """
+
+    def __init__(self, m, window=None):
+        assert m > 1, "Must be modulo an integer greater than 1"
+        self.m = m
+        self._k = m.bit_length()
+        # Barrett: mu = floor(4^k / m), valid for inputs below m^2
+        self._mu = (1 << (2 * self._k)) // m
+        if window is None:
+            window = 1 if self._k < 32 else 3 if self._k < 256 else 6
+        self.window = window
+
+    @classmethod
+    def of(cls, m):
+        """Return m if it is already a context, otherwise make a context for m"""
+        return m if isinstance(m, cls) else cls(m)
+
+    # Reduction
+
+    def reduce(self, x):
+        """Reduce x modulo m, using Barrett reduction when 0 <= x < m^2"""
+        if self._k < BARRETT_MIN_BITS or x < 0 or x.bit_length() > 2 * self._k:
+            return x % self.m
+        q = ((x >> (self._k - 1)) * self._mu) >> (self._k + 1)
+        r = x - q * self.m
+        while r >= self.m:
+            r -= self.m
+        return r
+
+    def mul(self, a, b):
+        """Compute a*b mod m for residues a, b"""
+        return self.reduce(a * b)
+
+    def sqr(self, a):
+        """Compute a^2 mod m for a residue a"""
+        return self.reduce(a * a)
+
+    # Exponentiation
+
+    def pow(self, a, e):
+        """Compute a^e mod m with sliding-window exponentiation"""
+        if self._k < BARRETT_MIN_BITS:
+            return pow(a, e, self.m)
+        if e < 0:
+            a = pow(a, -1, self.m)
+            e = -e
+        mul = self.mul
+        odd_powers = self._odd_powers(a % self.m, mul)
+        result = 1
+        i = e.bit_length() - 1
+        while i >= 0:
+            if not (e >> i) & 1:
+                result = mul(result, result)
+                i -= 1
+                continue
+            # Take the longest window ending in a 1 bit
+            j = max(i - self.window + 1, 0)
+            while not (e >> j) & 1:
+                j += 1
+            for _ in range(i - j + 1):
+                result = mul(result, result)
+            result = mul(result, odd_powers[((e >> j) & ((1 << (i - j + 1)) - 1)) >> 1])
+            i = j - 1
+        return result % self.m
+
+    def _odd_powers(self, a, mul):
+        """Get [a, a^3, a^5, ...] up to the window size"""
+        odd_powers = [a]
+        if self.window > 1:
+            a2 = mul(a, a)
+            for _ in range((1 << (self.window - 1)) - 1):
+                odd_powers.append(mul(odd_powers[-1], a2))
+        return odd_powers
+
+    def fixed_base(self, g, max_bits=None, window=4):
+        """Precompute a table for raising g to many different exponents
+
+        Exponents of up to max_bits bits (by default, the size of m) then
+        need no squarings at all, only one multiplication per window.
+        """
+        return FixedBasePow(self, g, max_bits or self._k, window)
+
+    def __repr__(self):
+        return f"ModContext({self.m})"
+
+
+class FixedBasePow:
+    """Exponentiation of a fixed base modulo a fixed modulus, using a
+    table of g^(j 2^(wi)) for every window position i and digit j"""
+
+    def __init__(self, context, g, max_bits, window):
+        self.context = context
+        self.g = g % context.m
+        self.max_bits = max_bits
+        self.window = window
+        mul = context.mul
+        self._table = []
+        base = self.g
+        for _ in range(math.ceil(max_bits / window)):
+            row = [1, base]
+            for _ in range((1 << window) - 2):
+                row.append(mul(row[-1], base))
+            self._table.append(row)
+            base = mul(row[-1], base)
+
+    def __call__(self, e):
+        """Compute g^e mod m"""
+        if e < 0 or e.bit_length() > self.max_bits:
+            return self.context.pow(self.g, e)
+        mul = self.context.mul
+        mask = (1 << self.window) - 1
+        result = 1
+        for row in self._table:
+            if e == 0:
+                break
+            digit = e & mask
+            if digit:
+                result = mul(result, row[digit])
+            e >>= self.window
+        return result
@@ -0,0 +1,107 @@
+import json
+import math
+import os
+
+from .ecm import ecm
+from .prime import eratosthenes, pollard_rho, rabin_miller
+
+# Primes up to this are found by trial division, from the residues of the
+# running product rather than by dividing the product itself
+TRIAL_BOUND = 10 ** 5
+# Iterations of Pollard's rho before handing a cofactor to ECM
+RHO_ITERATIONS = 1 << 16
+RABIN_MILLER_ITERATIONS = 40
+
+
+class EuclidMullin:
+    """The sequence where each term is the least prime factor of one more
+    than the product of all the terms before it
+
+    Iterating over the sequence gives its terms forever, starting from the
+    given starting terms. The product is kept as it grows, along with its
+    residues modulo the primes up to trial_bound, so most terms are found
+    without touching the product at all. Otherwise one more than it is
+    factored completely, with Pollard's rho and then the elliptic curve
+    method, to be sure of finding its least prime factor.
+
+    If a checkpoint path is given, the terms (and the progress on factoring
+    the next one) are saved there as they are found, and a later sequence
+    with the same path picks up where it left off.
+    """
+
+    def __init__(self, start=(2,), checkpoint=None, trial_bound=TRIAL_BOUND):
+        self.checkpoint = checkpoint
+        self.terms = list(start)
+        # The prime factors found and the composite cofactors left, of one
+        # more than the product, while it is being factored
+        self.found = []
+        self.cofactors = []
+        if checkpoint is not None and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                state = json.load(f)
+            self.terms = state["terms"]
+            self.found = state["found"]
+            self.cofactors = state["cofactors"]
+        self.product = math.prod(self.terms)
+        self.primes = eratosthenes(max(trial_bound, 0))
+        self.residues = [self.product % p for p in self.primes]
+
+    def __iter__(self):
+        yield from self.terms
+        while True:
+            yield self.next_term()
+
+    def save(self):
+        """Write the state to the checkpoint file, if there is one, replacing
+        it all at once so an interrupted write loses nothing"""
+        if self.checkpoint is None:
+            return
+        state = {"terms": self.terms, "found": self.found, "cofactors": self.cofactors}
+        temp = f"{self.checkpoint}.{os.getpid()}.tmp"
+        with open(temp, "w") as f:
+            json.dump(state, f)
+        os.replace(temp, self.checkpoint)
+
+    def trial_factor(self):
+        """Get the least prime up to trial_bound dividing one more than the
+        product, or None if there is none"""
+        for p, r in zip(self.primes, self.residues):
+            if r + 1 == p:
+                return p
+        return None
+
+    def least_factor(self):
+        """Get the least prime factor of one more than the product"""
+        p = self.trial_factor()
+        if p is not None:
+            return p
+        if not self.found and not self.cofactors:
+            self.cofactors = [self.product + 1]
+        while self.cofactors:
+            c = self.cofactors.pop()
+            if rabin_miller(c, RABIN_MILLER_ITERATIONS):
+                self.found.append(c)
+                continue
+            d = pollard_rho(c, RHO_ITERATIONS) or ecm(c)
+            if d is None:
+                self.cofactors.append(c)
+                self.save()
+                raise RuntimeError(f"Could not factor {c}")
+            self.cofactors += [d, c // d]
+            self.save()
+        return min(self.found)
+
+    def append(self, p):
+        """Add the next term to the sequence"""
+        self.terms.append(p)
+        self.product *= p
+        self.residues = [r * p % q for r, q in zip(self.residues, self.primes)]
+        self.found = []
+        self.cofactors = []
+        self.save()
+
+    def next_term(self):
+        """Find the next term and add it to the sequence"""
+        p = self.least_factor()
+        self.append(p)
+        return p
@@ -0,0 +1,158 @@
+from collections import Counter
+from math import gcd, isqrt
+
+from .prime import eratosthenes, prime_factor
+
+FUNCTIONS = ("phi", "carmichael", "mobius", "sigma", "omega")
+
+
+def _lcm(a, b):
+    return a // gcd(a, b) * b
+
+
+def _prime_power_values(p, e, q):
+    """Get each function at the prime power q = p^e"""
+    phi = q - q // p
+    return {
+        "phi": phi,
+        "carmichael": phi // 2 if p == 2 and e >= 3 else phi,
+        "mobius": -1 if e == 1 else 0,
+        "sigma": (q * p - 1) // (p - 1),
+        "omega": 1,
+    }
+
+
+def _combine(name, a, b):
+    """Combine a function's values at two coprime numbers"""
+    if name == "carmichael":
+        return _lcm(a, b)
+    elif name == "omega":
+        return a + b
+    return a * b
+
+
+def euler_phi(n):
+    """Compute Euler's totient function of n"""
+    return multiplicative_values(n)["phi"]
+
+
+def carmichael(n):
+    """Compute the Carmichael function of n, the exponent of (Z/nZ)*"""
+    return multiplicative_values(n)["carmichael"]
+
+
+def multiplicative_values(n, factors=None):
+    """Compute phi, lambda, mu, sigma and omega of a single n from its
+    prime factorization"""
+    values = {"phi": 1, "carmichael": 1, "mobius": 1, "sigma": 1, "omega": 0}
+    for p, e in Counter(factors or prime_factor(n)).items():
+        part = _prime_power_values(p, e, p ** e)
+        values = {name: _combine(name, values[name], part[name]) for name in values}
+    return values
+
+
+def sieve_multiplicative(n, functions=FUNCTIONS):
+    """Compute the given functions (from "phi", "carmichael", "mobius",
+    "sigma" and "omega") for every integer in [0, n] by a linear sieve
+
+    Returns a dictionary from each name to a list of its values, with 0 at
+    index 0.
+    """
+    # Smallest prime factor, and the power of it dividing each number
+    spf = [0] * (n + 1)
+    ppow = [0] * (n + 1)
+    primes = []
+    for i in range(2, n + 1):
+        if spf[i] == 0:
+            spf[i] = ppow[i] = i
+            primes.append(i)
+        p_i = spf[i]
+        for p in primes:
+            if p > p_i or i * p > n:
+                break
+            spf[i * p] = p
+            ppow[i * p] = ppow[i] * p if p == p_i else p
+    tables = {name: [0] * (n + 1) for name in functions}
+    for name in functions:
+        if n >= 1:
+            tables[name][1] = 0 if name == "omega" else 1
+    for i in range(2, n + 1):
+        q = ppow[i]
+        rest = i // q
+        if rest == 1:
+            p = spf[i]
+            e = 1
+            while q > p ** e:
+                e += 1
+            part = _prime_power_values(p, e, q)
+            for name in functions:
+                tables[name][i] = part[name]
+        else:
+            for name in functions:
+                table = tables[name]
+                table[i] = _combine(name, table[rest], table[q])
+    return tables
+
+
+def segment_multiplicative(lo, hi, functions=FUNCTIONS, primes=None):
+    """Compute the given functions for every integer in range(lo, hi),
+    with 1 <= lo, by dividing out the primes up to sqrt(hi)
+
+    Returns a dictionary from each name to a list of its values.
+    """
+    assert 1 <= lo <= hi, "Must be a range of positive integers"
+    size = hi - lo
+    rest = list(range(lo, hi))
+    tables = {
+        name: [0 if name == "omega" else 1] * size for name in functions
+    }
+    if primes is None:
+        primes = eratosthenes(isqrt(max(hi - 1, 1)))
+    for p in primes:
+        for i in range((-lo) % p, size, p):
+            q = 1
+            e = 0
+            while rest[i] % p == 0:
+                rest[i] //= p
+                q *= p
+                e += 1
+            part = _prime_power_values(p, e, q)
+            for name in functions:
+                tables[name][i] = _combine(name, tables[name][i], part[name])
+    for i in range(size):
+        # Anything left over is a single prime above sqrt(hi)
+        p = rest[i]
+        if p > 1:
+            part = _prime_power_values(p, 1, p)
+            for name in functions:
+                tables[name][i] = _combine(name, tables[name][i], part[name])
+    return tables
+
+
+def iter_multiplicative(lo, hi, segment_size=1 << 16, functions=FUNCTIONS):
+    """Generate (n, values) for every n in range(lo, hi), where values maps
+    each function name to its value at n, sieving one segment at a time so
+    memory stays bounded"""
+    primes = eratosthenes(isqrt(max(hi - 1, 1)))
+    for start in range(max(lo, 1), hi, segment_size):
+        stop = min(start + segment_size, hi)
+        tables = segment_multiplicative(start, stop, functions, primes)
+        for i in range(stop - start):
+            yield start + i, {name: tables[name][i] for name in functions}
+
+
+def carmichael_numbers(lo, hi, segment_size=1 << 16):
+    """List the Carmichael numbers in range(lo, hi): the composite n with
+    lambda(n) | n-1, from a segmented sieve rather than factoring each n"""
+    primes = eratosthenes(isqrt(max(hi - 1, 1)))
+    found = []
+    for start in range(max(lo, 2), hi, segment_size):
+        stop = min(start + segment_size, hi)
+        tables = segment_multiplicative(
+            start, stop, ("carmichael", "omega"), primes
+        )
+        for i in range(stop - start):
+            n = start + i
+            if tables["omega"][i] > 1 and (n - 1) % tables["carmichael"][i] == 0:
+                found.append(n)
+    return found
@@ -0,0 +1,28 @@
+from collections import Counter
+from math import gcd
+
+from .modcontext import ModContext
+from .multiplicative import carmichael
+from .prime import prime_factor
+
+
+def find_order(a, m):
+    """Compute the order of a mod m, where m may be a `ModContext`
+
+    The order divides the Carmichael function lambda(m), so it is found by
+    dividing primes out of lambda(m) for as long as a^k stays 1.
+    """
+    context = ModContext.of(m) if m != 1 else None
+    if context is not None:
+        m = context.m
+    if gcd(a, m) != 1:
+        return None
+    if m == 1:
+        return 1
+    order = carmichael(m)
+    for q, e in Counter(prime_factor(order)).items():
+        for _ in range(e):
+            if context.pow(a, order // q) != 1:
+                break
+            order //= q
+    return order
@@ -0,0 +1,214 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import gcd, isqrt
+
+
+def is_int(f):
+    return f - int(f) == 0
+
+
+def _triple(m, n):
+    """Get the PPT (a, b, c) with a < b from Euclid's parametrization"""
+    a, b = m * m - n * n, 2 * m * n
+    return (a, b, m * m + n * n) if a < b else (b, a, m * m + n * n)
+
+
+def _next_coprime(m, n):
+    """Get the next n' > n, of opposite parity to m, coprime to m and below m"""
+    n += 2
+    while n < m and gcd(m, n) != 1:
+        n += 2
+    return n
+
+
+def iter_ppts(limit, by="c"):
+    """Generate all PPTs (a, b, c) with a < b, in increasing order of c (if
+    `by` is "c") or of a + b + c (if `by` is "perimeter"), stopping once
+    that exceeds the limit.
+
+    Triples come from Euclid's parametrization a, b = m^2 - n^2, 2mn with
+    m > n > 0 coprime and of opposite parity, and are merged in order
+    through a heap holding one pending n for each m, so memory grows only
+    as the square root of the limit.
+    """
+    if by == "c":
+        key = lambda m, n: m * m + n * n
+    elif by == "perimeter":
+        key = lambda m, n: 2 * m * (m + n)
+    else:
+        raise ValueError(f"Cannot order PPTs by {by!r}")
+    heap = [(key(2, 1), 2, 1)]
+    while heap:
+        k, m, n = heapq.heappop(heap)
+        if k > limit:
+            return
+        yield _triple(m, n)
+        if n <= 2:
+            # First triple for this m, so the next m may be needed now
+            heapq.heappush(heap, (key(m + 1, 2 - m % 2), m + 1, 2 - m % 2))
+        n = _next_coprime(m, n)
+        if n < m:
+            heapq.heappush(heap, (key(m, n), m, n))
+
+
+def _smallest_prime_factors(n):
+    """Sieve the smallest prime factor of every number up to n"""
+    spf = list(range(n + 1))
+    for i in range(2, isqrt(n) + 1):
+        if spf[i] == i:
+            for j in range(i * i, n + 1, i):
+                if spf[j] == j:
+                    spf[j] = i
+    return spf
+
+
+def count_ppts(limit, by="c"):
+    """Count the PPTs with c (or a + b + c, if `by` is "perimeter") at most
+    the limit, without generating them.
+
+    For each m, the number of valid n is found by inclusion-exclusion over
+    the prime factors of m, so this takes about sqrt(limit) steps.
+    """
+    if by == "c":
+        m_limit = isqrt(limit)
+        n_limit = lambda m: isqrt(max(limit - m * m, 0))
+    elif by == "perimeter":
+        m_limit = isqrt(limit // 2)
+        n_limit = lambda m: limit // (2 * m) - m
+    else:
+        raise ValueError(f"Cannot order PPTs by {by!r}")
+    spf = _smallest_prime_factors(m_limit)
+    count = 0
+    for m in range(2, m_limit + 1):
+        bound = min(m - 1, n_limit(m))
+        if bound <= 0:
+            continue
+        primes = []
+        k = m
+        while k > 1:
+            p = spf[k]
+            primes.append(p)
+            while k % p == 0:
+                k //= p
+        if m % 2 == 1:
+            # n = 2j must be even, and gcd(2j, m) = gcd(j, m)
+            bound //= 2
+        # Count the j <= bound coprime to m (for even m, coprime means odd)
+        divisors = [(1, 1)]
+        for p in primes:
+            divisors += [(d * p, -mu) for (d, mu) in divisors]
+        count += sum(mu * (bound // d) for (d, mu) in divisors)
+    return count
+
+
+def generate_ppts(limit):
+    """Create all PPTs with 2 <= a < b <= limit"""
+    return sorted(
+        ppt for ppt in iter_ppts(isqrt(2 * limit * limit)) if ppt[1] <= limit
+    )
+
+
+def _mark_ppts(limit, m_start, m_stop, bitmap=None):
+    """Set bit k of the bitmap for every k <= limit in a PPT with both legs
+    at most the limit, and with Euclid parameter m in range(m_start, m_stop)"""
+    if bitmap is None:
+        bitmap = bytearray(limit // 8 + 1)
+    for m in range(max(m_start, 2), m_stop):
+        m2 = m * m
+        # Need m^2 - n^2 <= limit and 2mn <= limit
+        n = isqrt(m2 - limit - 1) + 1 if m2 > limit else 1
+        if (m + n) % 2 == 0:
+            n += 1
+        n_stop = min(m, limit // (2 * m) + 1)
+        for n in range(n, n_stop, 2):
+            if gcd(m, n) != 1:
+                continue
+            for k in (m2 - n * n, 2 * m * n, m2 + n * n):
+                if k <= limit:
+                    bitmap[k >> 3] |= 1 << (k & 7)
+    return bitmap
+
+
+def _mark_ppts_slice(args):
+    """Mark the bits for k in range(lo, hi) only, as for _mark_ppts, in a
+    bitmap of their own starting from lo (a multiple of 8)"""
+    limit, lo, hi = args
+    hi = min(hi, limit + 1)
+    bitmap = bytearray((hi - lo + 7) // 8)
+    for m in range(2, isqrt(limit * 1208 // 1000) + 2):
+        m2 = m * m
+        # Need m^2 - n^2 <= limit and 2mn <= limit
+        n_start = isqrt(m2 - limit - 1) + 1 if m2 > limit else 1
+        n_stop = min(m, limit // (2 * m) + 1)
+        # The n putting m^2 - n^2, 2mn and m^2 + n^2 in range(lo, hi), as
+        # ranges of n with each end inclusive
+        ranges = (
+            (
+                isqrt(m2 - hi) + 1 if m2 >= hi else 1,
+                isqrt(m2 - lo) if m2 >= lo else 0,
+            ),
+            (-(-lo // (2 * m)), (hi - 1) // (2 * m)),
+            (
+                isqrt(lo - m2 - 1) + 1 if lo > m2 else 1,
+                isqrt(hi - 1 - m2) if hi > m2 else 0,
+            ),
+        )
+        for form, (first, last) in enumerate(ranges):
+            first = max(first, n_start)
+            if (m + first) % 2 == 0:
+                first += 1
+            for n in range(first, min(last + 1, n_stop), 2):
+                if gcd(m, n) != 1:
+                    continue
+                k = (m2 - n * n, 2 * m * n, m2 + n * n)[form] - lo
+                bitmap[k >> 3] |= 1 << (k & 7)
+    return lo, bitmap
+
+
+# Numbers marked by each process at a time, a multiple of 8
+SLICE_SIZE = 1 << 23
+
+
+def ppt_coverage(limit, processes=None, slice_size=SLICE_SIZE):
+    """Find all elements of PPTs with 2 <= a < b <= limit, as a bitmap with
+    bit k of byte k // 8 set iff k is in such a PPT.
+
+    If `processes` is given, the bitmap is split into slices of slice_size
+    numbers, which a pool of that many processes marks separately. Each
+    slice is copied into place as it finishes, so the whole thing takes
+    about limit bits, plus a slice for each slice not yet copied.
+    """
+    if processes is None:
+        # Both m^2 - n^2 <= limit and 2mn <= limit need m^2 <= (1 + sqrt 2) limit / 2
+        return _mark_ppts(limit, 2, isqrt(limit * 1208 // 1000) + 2)
+    assert slice_size % 8 == 0, "Slices must start on whole bytes"
+    bitmap = bytearray(limit // 8 + 1)
+    slices = [(limit, lo, lo + slice_size) for lo in range(0, limit + 1, slice_size)]
+    with ProcessPoolExecutor(processes) as pool:
+        for future in as_completed([pool.submit(_mark_ppts_slice, s) for s in slices]):
+            lo, part = future.result()
+            bitmap[lo >> 3 : (lo >> 3) + len(part)] = part
+    return bitmap
+
+
+def all_in_ppts(limit):
+    """List all elements in PPTs with 2 <= a < b <= limit"""
+    bitmap = ppt_coverage(limit)
+    return [bool(bitmap[n >> 3] >> (n & 7) & 1) for n in range(limit + 1)]
+
+
+def find_pythagoreans_by_c(s_limit):
+    """List all PPTs from t < s <= s_limit"""
+    triples = dict()
+    for s in range(3, s_limit + 1, 2):
+        for t in range(1, s, 2):
+            if gcd(s, t) != 1:
+                continue
+            a = s * t
+            b = (s ** 2 - t ** 2) // 2
+            c = (s ** 2 + t ** 2) // 2
+            if c in triples:
+                triples[c] += [(a, b)]
+            else:
+                triples[c] = [(a, b)]
+    return triples
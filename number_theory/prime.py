@@ -0,0 +1,463 @@
+import math
+
+from . import tracing
+from .memo import cached
+from .modcontext import BARRETT_MIN_BITS, ModContext
+
+
+def eratosthenes(n):
+    """Perform the Sieve of Eratosthenes to identify all prime numbers
+    up to n.
+
+    Returns all such primes as a list.
+    """
+    sieve = [False, False] + [True] * (n - 1)
+    for i in range(math.isqrt(n) + 1):
+        if not sieve[i]:
+            continue
+        for j in range(i * i, n + 1, i):
+            sieve[j] = False
+    return [n for (n, p) in enumerate(sieve) if p]
+
+
+def segmented_sieve(lo, hi, primes=None):
+    """List the primes in range(lo, hi), sieving only that window by the
+    primes up to sqrt(hi), which can be passed in if already known"""
+    lo = max(lo, 2)
+    sieve = sieve_segment(lo, hi, primes)
+    return [lo + i for i, flag in enumerate(sieve) if flag]
+
+
+def sieve_segment(lo, hi, primes=None):
+    """Sieve range(lo, hi) for 2 <= lo, returning a bytearray with a 1 at
+    index i iff lo + i is prime"""
+    if hi <= lo:
+        return bytearray()
+    if primes is None:
+        primes = eratosthenes(math.isqrt(hi - 1))
+    sieve = bytearray([1]) * (hi - lo)
+    for p in primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, (lo + p - 1) // p * p) - lo
+        sieve[start::p] = bytes(len(range(start, hi - lo, p)))
+    return sieve
+
+
+def is_prime(n, store=None):
+    """Returns true iff n is prime
+
+    A `primestore.PrimeStore` may be passed in to look n up there instead.
+    """
+    n = abs(n)
+    if store is not None:
+        return store.is_prime(n)
+    if n == 0 or n == 1:
+        return False
+    for p in eratosthenes(math.isqrt(n)):
+        if n % p == 0:
+            return False
+    return True
+
+
+# Primes below this are found by trial division in prime_factor, and
+# anything left over is split with Pollard's rho
+TRIAL_DIVISION_BOUND = 1000
+# Composites in this range first get HART_ITERATIONS steps of Hart's one
+# line factoring, which splits those with two nearly equal factors (or
+# factors in a ratio of small numbers) far sooner than rho does
+HART_RANGE = (2 ** 30, 2 ** 60)
+HART_ITERATIONS = 128
+# Factorizations of numbers above this are cached, see `memo`
+FACTOR_CACHE_MIN = 2 ** 48
+
+
+@cached(when=lambda n: n > FACTOR_CACHE_MIN)
+def prime_factor(n):
+    """Returns the prime factorization of n"""
+    if n < 2:
+        return []
+    factors = []
+    for p in eratosthenes(min(math.isqrt(n) + 1, TRIAL_DIVISION_BOUND)):
+        while n % p == 0:
+            n //= p
+            factors += [p]
+    if n == 1:
+        return factors
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m < TRIAL_DIVISION_BOUND ** 2 or rabin_miller(m, 40):
+            factors += [m]
+        else:
+            d = None
+            if HART_RANGE[0] <= m < HART_RANGE[1]:
+                d = hart(m, HART_ITERATIONS)
+            d = d or pollard_rho(m)
+            stack += [d, m // d]
+    return sorted(factors)
+
+
+def pollard_rho(n, max_iterations=None):
+    """Find a nontrivial factor of a composite n with Pollard's rho method,
+    using Brent's cycle finding and batched gcds
+
+    If max_iterations is given, each polynomial is only iterated about that
+    many times before giving up and returning None.
+    """
+    if n % 2 == 0:
+        return 2
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            if max_iterations is not None and r > max_iterations:
+                return None
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            # The batch overshot, so step through it one at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+
+def iroot(x, k):
+    """Compute floor(x^(1/k)) for a non-negative integer x"""
+    r = int(round(x ** (1 / k)))
+    while r ** k > x:
+        r -= 1
+    while (r + 1) ** k <= x:
+        r += 1
+    return r
+
+
+def _square_mask(m):
+    return sum(1 << r for r in {i * i % m for i in range(m)})
+
+
+# Bit r of each mask is set iff r is a square modulo 64, 63, 65 or 11, which
+# together let through only about 1 in 120 non-squares
+SQUARES_MOD_64 = _square_mask(64)
+SQUARES_MOD_63 = _square_mask(63)
+SQUARES_MOD_65 = _square_mask(65)
+SQUARES_MOD_11 = _square_mask(11)
+
+# Hart's method looks at multiples of n by this times 1, 2, 3, ..., which
+# makes the squares it looks for much more likely
+HART_MULTIPLIER = 480
+# Lehman's method goes through this many values of k at a time
+LEHMAN_BLOCK = 256
+
+
+def is_square(n):
+    """Returns true iff n is a perfect square, rejecting most non-squares
+    by their residues before taking a square root"""
+    if n < 0 or not SQUARES_MOD_64 >> (n & 63) & 1:
+        return False
+    r = n % 45045
+    if not (
+        SQUARES_MOD_63 >> r % 63 & 1
+        and SQUARES_MOD_65 >> r % 65 & 1
+        and SQUARES_MOD_11 >> r % 11 & 1
+    ):
+        return False
+    return math.isqrt(n) ** 2 == n
+
+
+def hart(n, max_iterations=None):
+    """Find a nontrivial factor of a composite n with Hart's one line
+    factoring algorithm, or return None after max_iterations multipliers
+
+    For i = 1, 2, 3, ..., this takes s = ceil(sqrt(cin)) for a constant c,
+    and when s^2 - cin is a square t^2, gcd(s - t, n) is usually a factor.
+    """
+    step = HART_MULTIPLIER * n
+    i = 0
+    while max_iterations is None or i < max_iterations * step:
+        i += step
+        s = math.isqrt(i - 1) + 1
+        m = s * s - i
+        if is_square(m):
+            g = math.gcd(s - math.isqrt(m), n)
+            if 1 < g < n:
+                return g
+    return None
+
+
+def lehman(n):
+    """Find a nontrivial factor of n > 1 with Lehman's method, returning None
+    iff n is prime, in O(n^(1/3)) steps
+
+    After trial division up to n^(1/3), for each k <= n^(1/3) it looks for a
+    square a^2 - 4kn = b^2 with a within n^(1/6)/(4 sqrt(k)) of sqrt(4kn).
+    Past k = n^(1/3)/16 only one a is possible, so those k are taken a block
+    at a time and only the values passing the square masks mod 64 and 63
+    are looked at further.
+    """
+    if n % 2 == 0:
+        return 2 if n > 2 else None
+    cube = iroot(n, 3)
+    for d in range(3, cube + 1, 2):
+        if n % d == 0:
+            return d
+    sixth = n ** (1 / 6)
+    fourn = 4 * n
+    few = min(cube, cube // 16 + 1)
+    for k in range(1, few + 1):
+        fourkn = k * fourn
+        a = math.isqrt(fourkn - 1) + 1
+        top = math.isqrt(fourkn) + int(sixth / (4 * math.sqrt(k))) + 1
+        while a <= top:
+            b2 = a * a - fourkn
+            if is_square(b2):
+                g = math.gcd(a + math.isqrt(b2), n)
+                if 1 < g < n:
+                    return g
+            a += 1
+    for start in range(few + 1, cube + 1, LEHMAN_BLOCK):
+        ks = range(start, min(start + LEHMAN_BLOCK, cube + 1))
+        roots = [math.isqrt(k * fourn - 1) + 1 for k in ks]
+        values = [a * a - k * fourn for a, k in zip(roots, ks)]
+        for a, b2 in zip(roots, values):
+            r = b2 % 4032
+            if SQUARES_MOD_64 >> (r & 63) & 1 and SQUARES_MOD_63 >> r % 63 & 1:
+                if is_square(b2):
+                    g = math.gcd(a + math.isqrt(b2), n)
+                    if 1 < g < n:
+                        return g
+    return None
+
+
+def rabin_miller(n, iters=100, context=None):
+    """Perform `iter` iterations on the Rabin Miller test, returning
+    True iff n can still be a prime
+
+    A `ModContext` for n may be passed in to reuse it across calls, and
+    one is only made here once n is large enough for it to pay off.
+    """
+    if context is None and n.bit_length() >= BARRETT_MIN_BITS:
+        context = ModContext(n)
+    if iters > (n + 3) // 4:
+        iters = (n + 3) // 4
+    q = n - 1
+    k = 0
+    while q % 2 == 0:
+        q //= 2
+        k += 1
+    for i in range(1, iters + 1):
+        if i % n == 0:
+            continue
+        if not rabin_miller_test_case(n, q, k, i, context):
+            return False
+    return True
+
+
+def rabin_miller_test_case(n, q, k, a, context=None):
+    """Check the base a in the Rabin-Miller primality test, returning
+    True iff a does not prevent $n = 1+q2^k$ from being prime"""
+    if context is None and n.bit_length() >= BARRETT_MIN_BITS:
+        context = ModContext(n)
+    base = pow(a, q, n) if context is None else context.pow(a, q)
+    if base == 1 or base == n - 1:
+        return True
+    for _ in range(k):
+        base = base * base % n if context is None else context.sqr(base)
+        if base == n - 1:
+            return True
+        if base == 1:
+            return False
+    return False
+
+
+tracing.register_latex(
+    {
+        "korselts.even": "{n} is even, so it is not Carmichael.\n",
+        "korselts.prime": "{n} is prime, so it is not Carmichael.\n",
+        "korselts.factors": "{n} has prime factors: ${factors}$\n\n",
+        "korselts.square": (
+            "${p}$ is a prime factor of ${n}$, and ${p}^2|n$, "
+            "so $n$ cannot be Carmichael.\n"
+        ),
+        "korselts.nondivisor": (
+            "${p}$ is a prime factor of ${n}$, and ${p}-1\\nmid{n}-1$, "
+            "so $n$ cannot be Carmichael.\n"
+        ),
+        "korselts.factor": (
+            "${p}$ is a prime factor of ${n}$, and both ${p}\\parallel{n}$ "
+            "and ${p}-1\\mid{n}-1$.\n\n"
+        ),
+        "korselts.carmichael": "All prime factors pass, so ${n}$ is Carmichael.\n",
+        "korselts.item": "\\item ",
+    }
+)
+
+
+def korselts(n, display=False):
+    """Return true iff n passes Korselt's Criterion"""
+    if not display and not tracing.active():
+        return _korselts(n)
+    with tracing.latex_output(display):
+        return _korselts(n)
+
+
+def _korselts(n):
+    traced = tracing.active()
+    if n % 2 == 0:
+        if traced:
+            tracing.emit("korselts.even", n=n)
+        return False
+    factors = prime_factor(n)
+    if len(factors) == 1:
+        if traced:
+            tracing.emit("korselts.prime", n=n)
+        return False
+    if traced:
+        tracing.emit("korselts.factors", n=n, factors=factors)
+    for factor in factors:
+        if n % (factor ** 2) == 0:
+            if traced:
+                tracing.emit("korselts.square", p=factor, n=n)
+            return False
+        if (n - 1) % (factor - 1) != 0:
+            if traced:
+                tracing.emit("korselts.nondivisor", p=factor, n=n)
+            return False
+        if traced:
+            tracing.emit("korselts.factor", p=factor, n=n)
+    if traced:
+        tracing.emit("korselts.carmichael", n=n)
+    return True
+
+
+def write_korselts_list(nums):
+    """Given a list of numbers, output the LaTeX for finding whether or
+    not they're Carmichael"""
+    with tracing.latex_output():
+        for n in nums:
+            tracing.emit("korselts.item")
+            korselts(n)
+
+
+tracing.register_latex(
+    {
+        "pollard.try": (
+            "Let's try $L = {multiplier}! = {L}$: "
+            "We find $2^L - 1 \\equiv {probe} \\pmod{{{n}}}$, "
+            "and thus that $\\gcd({n}, {probe}) = {g}"
+        ),
+        "pollard.found": (
+            " \\neq 1$, so we have found the smooth prime $p = {p}$. "
+            "We can divide into $n$ to get $q = {q}$.\n\n"
+            "Thus, we can factor ${n} = {p} \\cdot {q}$.\n"
+        ),
+        "pollard.fail": "$. This didn't work, so let's try the next value for $L$.\n\n",
+        "squares.try": "Let's try $b = {b}$: We find $N+b^2 = {value}",
+        "squares.found": (
+            " = {a}^2$. Thus we find $N = (a+b)(a-b) = {p} \\cdot {q}$.\n\n"
+        ),
+        "squares.try_multiple": "Let's try $b = {b}$: We find $k\\cdot N+b^2 = {value}",
+        "squares.found_multiple": (
+            " = {a}^2$. Thus we find $k \\cdot N = (a+b)(a-b) = {p}"
+            " \\cdot {q}$, so $N = {f1} \\cdot {f2}$.\n\n"
+        ),
+        "squares.fail": "$, which is not a perfect square, so this didn't work.\n\n",
+    }
+)
+
+
+def pollard(n, output=False):
+    """Use Pollard's p-1 method to try to factor n (only for n=p*q)"""
+    if not output and not tracing.active():
+        return _pollard(n)
+    with tracing.latex_output(output):
+        return _pollard(n)
+
+
+def _pollard(n):
+    traced = tracing.active()
+    L = 2
+    multiplier = 2
+    while True:
+        probe = (pow(2, L, n) + n - 1) % n
+        g = math.gcd(probe, n)
+        if traced:
+            tracing.emit(
+                "pollard.try", multiplier=multiplier, L=L, probe=probe, n=n, g=g
+            )
+        if g != 1:
+            if traced:
+                tracing.emit("pollard.found", p=g, q=n // g, n=n)
+            return g, n // g
+        if traced:
+            tracing.emit("pollard.fail")
+        multiplier += 1
+        L *= multiplier
+
+
+def n_plus_b_squared(n, output=False):
+    """Factor N by looking at N+b^2 values until a perfect square is reached"""
+    if not output and not tracing.active():
+        return _n_plus_b_squared(n)
+    with tracing.latex_output(output):
+        return _n_plus_b_squared(n)
+
+
+def _n_plus_b_squared(n):
+    traced = tracing.active()
+    b = 1
+    while True:
+        nb2 = n + b ** 2
+        if traced:
+            tracing.emit("squares.try", b=b, value=nb2)
+        if is_square(nb2):
+            a = math.isqrt(nb2)
+            if traced:
+                tracing.emit("squares.found", a=a, p=a + b, q=a - b)
+            return a + b, a - b
+        elif traced:
+            tracing.emit("squares.fail")
+        b += 1
+
+
+def k_n_plus_b_squared(k, n, output=False):
+    """Factor N by looking at k*N+b^2 values until a perfect square is reached"""
+    if not output and not tracing.active():
+        return _k_n_plus_b_squared(k, n)
+    with tracing.latex_output(output):
+        return _k_n_plus_b_squared(k, n)
+
+
+def _k_n_plus_b_squared(k, n):
+    traced = tracing.active()
+    b = 1
+    while True:
+        knb2 = k * n + b ** 2
+        if traced:
+            tracing.emit("squares.try_multiple", b=b, value=knb2)
+        if is_square(knb2):
+            a = math.isqrt(knb2)
+            f1 = math.gcd(a + b, n)
+            f2 = math.gcd(a - b, n)
+            if traced:
+                tracing.emit(
+                    "squares.found_multiple", a=a, p=a + b, q=a - b, f1=f1, f2=f2
+                )
+            return (f1, f2)
+        elif traced:
+            tracing.emit("squares.fail")
+        b += 1
@@ -0,0 +1,199 @@
+from itertools import accumulate
+from math import isqrt, log
+
+from .prime import eratosthenes, iroot, segmented_sieve, sieve_segment
+
+# phi(x, a) for a up to this many primes is read off a table over one
+# period of the primorial, 2*3*5*7*11*13*17 = 510510
+SMALL_PHI_PRIMES = 7
+
+# The largest base sieve kept for pi(y) lookups, and the size of the
+# blocks whose running counts it stores
+BASE_SIEVE_LIMIT = 10 ** 8
+BLOCK_SIZE = 128
+
+# Arguments to phi(x, a) below this are memoized between calls
+PHI_CACHE_BOUND = 1 << 24
+PHI_CACHE_SIZE = 1 << 20
+
+SEGMENT_SIZE = 1 << 18
+
+
+class PiTable:
+    """A sieve of the odd numbers up to a limit, with running prime counts
+    every `BLOCK_SIZE` entries so that pi(y) is a lookup and a short count"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        size = (limit + 1) // 2
+        sieve = bytearray([1]) * size
+        sieve[0] = 0
+        for i in range(1, (isqrt(limit) - 1) // 2 + 1):
+            if sieve[i]:
+                p = 2 * i + 1
+                start = p * p // 2
+                sieve[start::p] = bytes(len(range(start, size, p)))
+        self._sieve = sieve
+        self._counts = [0] + list(
+            accumulate(sieve.count(1, i, i + BLOCK_SIZE) for i in range(0, size, BLOCK_SIZE))
+        )
+
+    def pi(self, y):
+        """Count the primes up to y <= limit"""
+        if y < 2:
+            return 0
+        assert y <= self.limit, "Beyond the end of the table"
+        end = (y + 1) // 2
+        block = end // BLOCK_SIZE
+        return 1 + self._counts[block] + self._sieve.count(1, block * BLOCK_SIZE, end)
+
+
+class _SmallPhi:
+    """phi(x, a) for a <= SMALL_PHI_PRIMES, which is periodic modulo the
+    product of the first a primes"""
+
+    def __init__(self, primes):
+        self.tables = []
+        modulus = 1
+        for p in [1] + primes[:SMALL_PHI_PRIMES]:
+            modulus *= p
+            # Mark which of 0, ..., modulus are coprime to the modulus
+            coprime = bytearray([1]) * (modulus + 1)
+            coprime[0] = 0
+            for q in primes[: len(self.tables)]:
+                coprime[::q] = bytes(len(range(0, modulus + 1, q)))
+            table = list(accumulate(coprime))
+            self.tables.append((modulus, table[-1], table[:-1]))
+
+    def __call__(self, x, a):
+        modulus, total, table = self.tables[a]
+        return (x // modulus) * total + table[x % modulus]
+
+
+class PrimeCounter:
+    """Count primes up to x with Lehmer's form of the Meissel-Lehmer method
+
+    pi(x) = phi(x, a) + a - 1 - P2(x, a) - P3(x, a), where a = pi(x^(1/4)),
+    phi(x, a) counts the integers up to x with no prime factor among the
+    first a primes, and P2 and P3 count those which are a product of two or
+    three larger primes. Counts up to x^(2/3) come from a base sieve, and
+    the base sieve and the phi cache are kept between calls.
+    """
+
+    def __init__(self):
+        self._primes = eratosthenes(1 << 16)
+        self._small_phi = _SmallPhi(self._primes)
+        self._table = PiTable(1 << 16)
+        self._phi_cache = {}
+
+    def _ensure(self, x):
+        """Make sure the base sieve covers x^(2/3) (up to BASE_SIEVE_LIMIT)
+        and the prime list covers sqrt(x)"""
+        if isqrt(x) > self._primes[-1]:
+            self._primes = eratosthenes(2 * isqrt(x))
+        limit = min(max(iroot(x * x, 3), isqrt(x)), BASE_SIEVE_LIMIT)
+        if limit > self._table.limit:
+            self._table = PiTable(max(limit, 2 * self._table.limit))
+
+    def phi(self, x, a):
+        """Count the integers in [1, x] with none of the first a primes as a
+        factor"""
+        if a <= SMALL_PHI_PRIMES:
+            return self._small_phi(x, a)
+        primes = self._primes
+        if x < primes[a]:
+            return 1 if x >= 1 else 0
+        if x < primes[a] * primes[a] and x <= self._table.limit:
+            return self._table.pi(x) - a + 1
+        key = (x, a)
+        if x < PHI_CACHE_BOUND:
+            cached = self._phi_cache.get(key)
+            if cached is not None:
+                return cached
+        # phi(x, a) = phi(x, k) - sum over k < i <= a of phi(x / p_i, i - 1)
+        result = self._small_phi(x, SMALL_PHI_PRIMES)
+        pi = self._table.pi
+        limit = self._table.limit
+        for i in range(SMALL_PHI_PRIMES, a):
+            p = primes[i]
+            y = x // p
+            if y < p:
+                # Each remaining phi(x / p_i, i - 1) is just 1
+                result -= a - i
+                break
+            if y < p * p and y <= limit:
+                result -= pi(y) - i + 1
+            else:
+                result -= self.phi(y, i)
+        if x < PHI_CACHE_BOUND:
+            if len(self._phi_cache) >= PHI_CACHE_SIZE:
+                self._phi_cache.clear()
+            self._phi_cache[key] = result
+        return result
+
+    def pi(self, x):
+        """Count the primes up to x"""
+        if x <= self._table.limit:
+            return self._table.pi(x)
+        self._ensure(x)
+        if x <= self._table.limit:
+            return self._table.pi(x)
+        primes = self._primes
+        a = self.pi(iroot(x, 4))
+        b = self.pi(isqrt(x))
+        c = self.pi(iroot(x, 3))
+        total = self.phi(x, a) + (b + a - 2) * (b - a + 1) // 2
+        for i in range(a, b):
+            # P2: products of two primes above p_a, through pi(x / p_i)
+            w = x // primes[i]
+            total -= self.pi(w)
+            if i < c:
+                # P3: products of three primes above p_a
+                for j in range(i, self.pi(isqrt(w))):
+                    total -= self.pi(w // primes[j]) - j
+        return total
+
+    def nth_prime(self, k):
+        """Find the kth prime, with the 1st prime being 2"""
+        assert k >= 1, "There is no 0th prime"
+        if k < 6:
+            return [2, 3, 5, 7, 11][k - 1]
+        # Land just below the kth prime with an estimate and one count,
+        # then sieve forwards to it
+        ln = log(k)
+        estimate = int(k * (ln + log(ln) - 1 + (log(ln) - 2) / ln))
+        x = max(estimate - 2 * isqrt(estimate), 2)
+        count = self.pi(x)
+        while count >= k:
+            x = max(x - 4 * isqrt(x), 2)
+            count = self.pi(x)
+        sieving_primes = eratosthenes(isqrt(2 * x + SEGMENT_SIZE))
+        lo = x + 1
+        while True:
+            hi = lo + SEGMENT_SIZE
+            sieve = sieve_segment(lo, hi, sieving_primes)
+            found = sieve.count(1)
+            if count + found >= k:
+                return segmented_sieve(lo, hi, sieving_primes)[k - count - 1]
+            count += found
+            lo = hi
+
+
+_counter = None
+
+
+def _get_counter():
+    global _counter
+    if _counter is None:
+        _counter = PrimeCounter()
+    return _counter
+
+
+def prime_pi(x):
+    """Count the primes up to x"""
+    return _get_counter().pi(x)
+
+
+def nth_prime(k):
+    """Find the kth prime, with the 1st prime being 2"""
+    return _get_counter().nth_prime(k)
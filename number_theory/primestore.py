@@ -0,0 +1,190 @@
+import mmap
+import os
+import struct
+from math import isqrt
+
+from .prime import eratosthenes, rabin_miller, sieve_segment
+
+# The file is a header, then a bitmap with one byte for each block of 30
+# numbers and one bit for each residue coprime to 30, then the number of
+# primes before every INDEX_STRIDE bytes of the bitmap
+MAGIC = b"PRIMES30"
+HEADER = struct.Struct("<8sQQQ")
+INDEX_ENTRY = struct.Struct("<Q")
+INDEX_STRIDE = 4096
+WHEEL = (1, 7, 11, 13, 17, 19, 23, 29)
+WHEEL_BIT = {r: i for i, r in enumerate(WHEEL)}
+
+# Sieve this many bytes of bitmap (30 numbers each) at a time
+SEGMENT_BYTES = 1 << 16
+
+# is_prime tests numbers beyond both the store's bound and this limit with
+# Rabin-Miller, instead of growing the file to reach them
+IS_PRIME_LIMIT = 10 ** 9
+RABIN_MILLER_ITERATIONS = 40
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "number-theory-programs", "primes30.bin"
+)
+
+# For each byte value, the offsets within its block of 30 of the set bits
+_BYTE_OFFSETS = [
+    [r for i, r in enumerate(WHEEL) if byte >> i & 1] for byte in range(256)
+]
+# The mask of the bits for residues at most r, for each r in [0, 30)
+_PREFIX_MASK = [
+    sum(1 << i for i, s in enumerate(WHEEL) if s <= r) for r in range(30)
+]
+
+
+def _wheel_bytes(lo, hi, primes):
+    """Sieve range(lo, hi), for lo and hi multiples of 30, packed into the
+    wheel bitmap format"""
+    flags = sieve_segment(max(lo, 2), hi, primes)
+    if lo == 0:
+        flags = bytearray(2) + flags
+    packed = 0
+    for i, r in enumerate(WHEEL):
+        # Turn each flag into its bit, so the eight residues' bytes can be
+        # summed as big integers without overlapping
+        table = bytes([0, 1 << i]) + bytes(254)
+        packed += int.from_bytes(flags[r::30].translate(table), "little")
+    return packed.to_bytes((hi - lo) // 30, "little")
+
+
+class PrimeStore:
+    """The primes up to a bound, in a file opened by mmap so that any number
+    of processes share one copy
+
+    Queries beyond the bound extend the file (to at least double the
+    bound), which replaces it atomically so that processes which still have
+    the old file mapped are unaffected. The exception is is_prime, which
+    tests numbers above is_prime_limit directly.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, bound=10 ** 6, is_prime_limit=IS_PRIME_LIMIT):
+        self.path = path
+        self.is_prime_limit = is_prime_limit
+        self._file = None
+        self._map = None
+        if os.path.exists(path):
+            self._open()
+        else:
+            self.bound = 0
+        self.ensure(bound)
+
+    def _open(self):
+        self.close()
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bound, self._size, stride = HEADER.unpack_from(self._map)
+        if magic != MAGIC or stride != INDEX_STRIDE:
+            raise ValueError(f"{self.path} is not a prime store")
+        self._index_start = HEADER.size + self._size
+
+    def close(self):
+        """Unmap and close the file"""
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def ensure(self, bound):
+        """Extend the store, if necessary, to cover every n <= bound"""
+        if bound <= self.bound:
+            return
+        bound = max(bound, 2 * self.bound)
+        size = bound // 30 + 1
+        old_size = self._size if self._map is not None else 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        primes = eratosthenes(isqrt(30 * size))
+        counts = []
+        total = 0
+        with open(temp, "wb") as out:
+            out.write(HEADER.pack(MAGIC, 30 * size - 1, size, INDEX_STRIDE))
+            # Copy the existing bitmap, and sieve on from where it ends
+            for start in range(0, size, INDEX_STRIDE):
+                stop = min(start + INDEX_STRIDE, size)
+                if stop <= old_size:
+                    chunk = self._map[HEADER.size + start : HEADER.size + stop]
+                else:
+                    chunk = _wheel_bytes(30 * start, 30 * stop, primes)
+                counts.append(total)
+                total += int.from_bytes(chunk, "little").bit_count()
+                out.write(chunk)
+            counts.append(total)
+            for count in counts:
+                out.write(INDEX_ENTRY.pack(count))
+        os.replace(temp, self.path)
+        self._open()
+
+    def is_prime(self, n):
+        """Returns true iff n is prime"""
+        if n < 7:
+            return n in (2, 3, 5)
+        bit = WHEEL_BIT.get(n % 30)
+        if bit is None:
+            return False
+        if n > self.bound and n > self.is_prime_limit:
+            return rabin_miller(n, RABIN_MILLER_ITERATIONS)
+        self.ensure(n)
+        return bool(self._map[HEADER.size + n // 30] >> bit & 1)
+
+    def pi(self, x):
+        """Count the primes up to x"""
+        if x < 7:
+            return sum(1 for p in (2, 3, 5) if p <= x)
+        self.ensure(x)
+        block = x // 30
+        start = block // INDEX_STRIDE * INDEX_STRIDE
+        count = 3 + INDEX_ENTRY.unpack_from(
+            self._map, self._index_start + 8 * (start // INDEX_STRIDE)
+        )[0]
+        chunk = self._map[HEADER.size + start : HEADER.size + block]
+        count += int.from_bytes(chunk, "little").bit_count()
+        last = self._map[HEADER.size + block] & _PREFIX_MASK[x % 30]
+        return count + last.bit_count()
+
+    def primes_between(self, lo, hi):
+        """Generate the primes in range(lo, hi) in order"""
+        for p in (2, 3, 5):
+            if lo <= p < hi:
+                yield p
+        if hi <= 7:
+            return
+        self.ensure(hi - 1)
+        lo = max(lo, 7)
+        for start in range(lo // 30, (hi - 1) // 30 + 1, SEGMENT_BYTES):
+            stop = min(start + SEGMENT_BYTES, (hi - 1) // 30 + 1)
+            chunk = self._map[HEADER.size + start : HEADER.size + stop]
+            for i, byte in enumerate(chunk):
+                if byte:
+                    base = 30 * (start + i)
+                    for r in _BYTE_OFFSETS[byte]:
+                        if lo <= base + r < hi:
+                            yield base + r
+
+    def __repr__(self):
+        return f"PrimeStore({self.path!r}, {self.bound})"
+
+
+_stores = {}
+
+
+def open_store(path=None, bound=10 ** 6):
+    """Get the shared store for a path (by default, the PRIME_STORE
+    environment variable or a file under ~/.cache), covering at least bound"""
+    path = path or os.environ.get("PRIME_STORE", DEFAULT_PATH)
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = PrimeStore(path, bound)
+    else:
+        store.ensure(bound)
+    return store
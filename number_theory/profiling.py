@@ -0,0 +1,281 @@
+import functools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# The kernels which profile() instruments, as (module, attribute, ops),
+# where attribute may be "Class.method" and ops, if given, is called with
+# the kernel's arguments to count the operations done by that call
+KERNELS = [
+    ("modcontext", "ModContext.mul", None),
+    ("modcontext", "ModContext.sqr", None),
+    ("modcontext", "ModContext.pow", lambda self, a, e: abs(e).bit_length()),
+    ("math", "gcd", None),
+    ("euclid", "xgcd", None),
+    ("euclid", "lehmer_xgcd", None),
+    ("euclid", "half_gcd_xgcd", None),
+    ("euclid", "extended_euclidean", None),
+    ("euclid", "inverse", None),
+    ("euclid", "inverse_many", lambda values, m: len(values)),
+    ("jacobi", "jacobi", None),
+    ("prime", "eratosthenes", lambda n: n),
+    ("prime", "sieve_segment", lambda lo, hi, primes=None: max(hi - lo, 0)),
+    ("prime", "rabin_miller", lambda n, iters=100, context=None: iters),
+    ("prime", "pollard_rho", None),
+    ("prime", "hart", None),
+    ("prime", "lehman", None),
+    ("prime", "prime_factor", None),
+    ("sqrtmod", "sqrt_mod_prime", None),
+    ("primecount", "PrimeCounter.phi", None),
+    ("gaussian", "GaussianInteger.__init__", None),
+]
+
+# Methods instrumented on the classes made by rings.ModularIntegers and by
+# elliptic.EllipticCurve, which are made afresh for each modulus or curve
+MODULAR_METHODS = ("__new__", "__add__", "__sub__", "__mul__", "__neg__")
+POINT_METHODS = ("__init__", "__add__", "double", "__mul__")
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stats:
+    """Counters and timings collected by `profile`
+
+    For each kernel, this counts calls and operations, and times both the
+    total time spent inside it and its self time, excluding the kernels and
+    spans it called. Self time is also kept for each stack of kernels, for
+    flame graphs.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.ops = Counter()
+        self.seconds = Counter()
+        self.self_seconds = Counter()
+        self.stacks = Counter()
+        self._stack = []
+        self._depth = Counter()
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+        self._depth[name] += 1
+
+    def _exit(self, name):
+        _, start, child = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        own = elapsed - child
+        self.calls[name] += 1
+        self.self_seconds[name] += own
+        self.stacks[";".join(frame[0] for frame in self._stack) + ";" + name] += own
+        self._depth[name] -= 1
+        # Recursive calls are already covered by the outermost one
+        if self._depth[name] == 0:
+            self.seconds[name] += elapsed
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def wrap(self, fn, name, ops=None):
+        """Wrap fn so that its calls are recorded as the kernel name"""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if ops is not None:
+                self.ops[name] += ops(*args, **kwargs)
+            self._enter(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit(name)
+
+        return wrapper
+
+    @contextmanager
+    def span(self, name):
+        """Time a block of code as its own entry, like a kernel"""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit(name)
+
+    def to_dict(self):
+        """Get the counters and timings of each kernel as a dictionary"""
+        return {
+            name: {
+                "calls": self.calls[name],
+                "ops": self.ops[name],
+                "seconds": self.seconds[name],
+                "self_seconds": self.self_seconds[name],
+            }
+            for name in sorted(
+                self.calls, key=self.self_seconds.__getitem__, reverse=True
+            )
+        }
+
+    def to_json(self, path=None):
+        """Write the counters as JSON to path, or return them as a string"""
+        data = json.dumps({"kernels": self.to_dict()}, indent=2)
+        if path is None:
+            return data
+        with open(path, "w") as f:
+            f.write(data)
+
+    def to_collapsed(self, path=None):
+        """Write the self time of each stack, in microseconds, in the
+        collapsed stack format read by flamegraph.pl and speedscope, to
+        path or return it as a string"""
+        lines = "".join(
+            f"{stack.lstrip(';')} {round(seconds * 1e6)}\n"
+            for stack, seconds in sorted(self.stacks.items())
+            if round(seconds * 1e6) > 0
+        )
+        if path is None:
+            return lines
+        with open(path, "w") as f:
+            f.write(lines)
+
+    def __str__(self):
+        rows = [
+            f"{'kernel':<40}{'calls':>12}{'ops':>14}{'total s':>12}{'self s':>12}"
+        ]
+        for name, row in self.to_dict().items():
+            rows.append(
+                f"{name:<40}{row['calls']:>12}{row['ops']:>14}"
+                f"{row['seconds']:>12.4f}{row['self_seconds']:>12.4f}"
+            )
+        return "\n".join(rows)
+
+
+class _Patcher:
+    """Replaces attributes for the duration of a profile, remembering the
+    originals so they can be put back"""
+
+    def __init__(self):
+        self._saved = []
+        self._done = set()
+
+    def set(self, owner, attribute, value):
+        self._saved.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, value)
+
+    def function(self, stats, module, attribute, name, ops):
+        """Instrument a function, along with every copy of it imported into
+        the repository's modules"""
+        original = getattr(module, attribute)
+        wrapper = stats.wrap(original, name, ops)
+        for other in _repo_modules() + [module]:
+            for key, value in list(vars(other).items()):
+                if value is original:
+                    self.set(other, key, wrapper)
+        return wrapper
+
+    def method(self, stats, cls, attribute, name, ops=None):
+        """Instrument a method defined on a class"""
+        if (cls, attribute) in self._done or attribute not in cls.__dict__:
+            return
+        self._done.add((cls, attribute))
+        raw = cls.__dict__[attribute]
+        fn = raw.__func__ if isinstance(raw, staticmethod) else raw
+        wrapper = stats.wrap(fn, name, ops)
+        if isinstance(raw, staticmethod) or attribute == "__new__":
+            wrapper = staticmethod(wrapper)
+        self.set(cls, attribute, wrapper)
+
+    def restore(self):
+        for owner, attribute, value in reversed(self._saved):
+            setattr(owner, attribute, value)
+        self._saved.clear()
+        self._done.clear()
+
+
+def _loaded(name):
+    """Get a module of the package by name, or another module such as math,
+    if it has been imported"""
+    return sys.modules.get(f"{__package__}.{name}") or sys.modules.get(name)
+
+
+def _repo_modules():
+    """Get the modules imported from this repository, each once although
+    the top-level shims list them under two names"""
+    modules = []
+    for module in {id(m): m for m in list(sys.modules.values())}.values():
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _ROOT:
+            modules.append(module)
+    return modules
+
+
+@contextmanager
+def profile(classes=()):
+    """Count calls and operations of the arithmetic kernels, and time them,
+    for the duration of the block:
+
+        with profile() as stats:
+            discrete_log(g, p, a)
+        print(stats)
+
+    Only modules already imported are instrumented. Outside of a profile
+    nothing is instrumented, so there is no cost at all. The classes made by
+    `rings.ModularIntegers` are always covered, points are covered for curves
+    made inside the block, and the point class of other curves can be passed
+    in, as `curve.point`.
+    """
+    stats = Stats()
+    patcher = _Patcher()
+    try:
+        for module_name, attribute, ops in KERNELS:
+            module = _loaded(module_name)
+            if module is None:
+                continue
+            name = f"{module_name}.{attribute}"
+            if "." in attribute:
+                class_name, method = attribute.split(".")
+                patcher.method(stats, getattr(module, class_name), method, name, ops)
+            else:
+                patcher.function(stats, module, attribute, name, ops)
+        rings = _loaded("rings")
+        if rings is not None:
+            _instrument_modular(stats, patcher, rings)
+        elliptic = _loaded("elliptic")
+        if elliptic is not None:
+            _instrument_points(stats, patcher, elliptic)
+        for cls in classes:
+            _instrument_class(stats, patcher, cls, "elliptic.Point", POINT_METHODS)
+        yield stats
+    finally:
+        patcher.restore()
+
+
+def _instrument_class(stats, patcher, cls, prefix, methods):
+    for method in methods:
+        patcher.method(stats, cls, method, f"{prefix}.{method}")
+
+
+def _instrument_modular(stats, patcher, rings):
+    factory = rings.ModularIntegers
+    for cls in factory.classes_made():
+        _instrument_class(stats, patcher, cls, "rings.Modular", MODULAR_METHODS)
+
+    @functools.wraps(factory)
+    def instrumented_factory(*args):
+        cls = factory(*args)
+        _instrument_class(stats, patcher, cls, "rings.Modular", MODULAR_METHODS)
+        return cls
+
+    for module in _repo_modules():
+        for key, value in list(vars(module).items()):
+            if value is factory:
+                patcher.set(module, key, instrumented_factory)
+
+
+def _instrument_points(stats, patcher, elliptic):
+    curve_init = elliptic.EllipticCurve.__init__
+
+    def instrumented_init(self, *args):
+        curve_init(self, *args)
+        _instrument_class(stats, patcher, self.point, "elliptic.Point", POINT_METHODS)
+
+    patcher.set(elliptic.EllipticCurve, "__init__", instrumented_init)
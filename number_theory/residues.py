@@ -0,0 +1,209 @@
+from collections import Counter
+from math import gcd
+
+from .discrete_log import find_generator
+from .euclid import CRTBasis
+from .prime import prime_factor, rabin_miller
+from . import tracing
+
+# Largest prime power for which a lookup table of residues is built
+TABLE_LIMIT = 10 ** 7
+
+
+class _PrimePowerResidues:
+    """The k-th power residues modulo a prime power p^e"""
+
+    def __init__(self, p, e, k, table_limit):
+        self.p, self.e, self.k = p, e, k
+        self.n = p ** e
+        if p == 2:
+            # The units are {+-1} x <5>, with 5 of order 2^(e-2)
+            self._order = max(self.n // 4, 1)
+            self._d = gcd(k, self._order)
+        else:
+            self._order = self.n // p * (p - 1)
+            self._d = gcd(k, self._order)
+        self._table = None
+        if self.n <= table_limit:
+            self._table = bytearray(self.n)
+            for r in self._generate():
+                self._table[r] = 1
+
+    def _unit_generators(self):
+        """Get generators of the group of k-th powers of units"""
+        p, n = self.p, self.n
+        if p == 2:
+            gens = [pow(5, self.k, n)]
+            if self.k % 2 == 1:
+                gens.append(n - 1)
+            return gens
+        g = find_generator(p) if p > 2 else 1
+        if self.e > 1 and pow(g, p - 1, p * p) == 1:
+            g += p
+        return [pow(g, self._d, n)]
+
+    def _generate(self):
+        """Generate every residue, including the non-units"""
+        units = [1]
+        for g in self._unit_generators():
+            subgroup = list(units)
+            power = g % self.n
+            while power != 1:
+                subgroup += [u * power % self.n for u in units]
+                power = power * g % self.n
+            units = subgroup
+        yield 0
+        yield from units
+        # p^(jk) times a unit k-th power modulo p^(e-jk)
+        j = 1
+        while j * self.k < self.e:
+            v = self.p ** (j * self.k)
+            yield from sorted({u * v % self.n for u in units})
+            j += 1
+
+    def _is_unit_residue(self, u, e):
+        n = self.p ** e
+        if e == 0 or n == 2:
+            return True
+        if self.p == 2:
+            # Odd powers permute the units, and even powers land in <5^k>,
+            # the units which are 1 (mod 4) and killed by order / gcd(k, order)
+            if self.k % 2 == 1:
+                return True
+            order = n // 4
+            return u % 4 == 1 and pow(u, order // gcd(self.k, order), n) == 1
+        order = n // self.p * (self.p - 1)
+        return pow(u, order // gcd(self.k, order), n) == 1
+
+    def __contains__(self, a):
+        a %= self.n
+        if self._table is not None:
+            return self._table[a] == 1
+        if a == 0:
+            return True
+        v = 0
+        while a % self.p == 0:
+            a //= self.p
+            v += 1
+        return v % self.k == 0 and self._is_unit_residue(a, self.e - v)
+
+    def _unit_count(self, e):
+        n = self.p ** e
+        if e == 0:
+            return 1
+        if self.p == 2:
+            if e <= 2:
+                return 1 if self.k % 2 == 0 or e == 1 else 2
+            order = n // 4
+            return order // gcd(self.k, order) * (2 if self.k % 2 == 1 else 1)
+        order = n // self.p * (self.p - 1)
+        return order // gcd(self.k, order)
+
+    def count(self):
+        count = 1 + self._unit_count(self.e)
+        j = 1
+        while j * self.k < self.e:
+            count += self._unit_count(self.e - j * self.k)
+            j += 1
+        return count
+
+    def to_list(self):
+        if self._table is not None:
+            return [a for a in range(self.n) if self._table[a]]
+        return sorted(self._generate())
+
+
+class PowerResidues:
+    """The k-th power residues modulo n, including 0
+
+    For a prime power, the unit residues are the subgroup generated by
+    g^gcd(k, phi) for a primitive root g, and are listed into a table
+    when small enough. Composite moduli are split into prime powers, so
+    membership is checked on each piece and counts multiply.
+    """
+
+    def __init__(self, n, k, factors=None, table_limit=TABLE_LIMIT):
+        assert n > 0 and k > 0, "Must have a positive modulus and exponent"
+        self.n = n
+        self.k = k
+        if factors is None:
+            if n > 2 and n % 2 == 1 and rabin_miller(n, 40):
+                factors = [n]
+            else:
+                factors = prime_factor(n)
+        self._parts = [
+            _PrimePowerResidues(p, e, k, table_limit)
+            for (p, e) in sorted(Counter(factors).items())
+        ]
+
+    def __contains__(self, a):
+        return all(a in part for part in self._parts)
+
+    def count(self):
+        """Count the residues, without listing them"""
+        count = 1
+        for part in self._parts:
+            count *= part.count()
+        return count
+
+    def __len__(self):
+        return self.count()
+
+    def to_list(self):
+        """List the residues in increasing order"""
+        if len(self._parts) == 0:
+            return [0]
+        if len(self._parts) == 1:
+            return self._parts[0].to_list()
+        basis = CRTBasis([part.n for part in self._parts])
+        values = [[]]
+        for part in self._parts:
+            values = [v + [r] for v in values for r in part.to_list()]
+        return sorted(basis.reconstruct_many(values))
+
+    def __repr__(self):
+        return f"PowerResidues({self.n}, {self.k})"
+
+
+def list_quadratic(n):
+    return PowerResidues(n, 2).to_list()
+
+
+tracing.register_latex(
+    {
+        "cubic.table": lambda p: "".join(
+            [
+                "\\begin{tabular}{ c|c }\n$a$ & $a^3$ \\\\\n\\hline\n",
+                *("{} & {} \\\\\n".format(a, pow(a, 3, p)) for a in range(1, p)),
+                "\\end{tabular}\n",
+            ]
+        ),
+        "cubic.residues": lambda p, residues: (
+            "Thus, we observe the cubic residues modulo {} are {}\n".format(
+                p, ", ".join(map(str, residues))
+            )
+        ),
+    }
+)
+
+
+def list_cubic(p, display_output=True):
+    if not display_output and not tracing.active():
+        return _list_cubic(p)
+    with tracing.latex_output(display_output):
+        return _list_cubic(p)
+
+
+def _list_cubic(p):
+    if tracing.active():
+        tracing.emit("cubic.table", p=p)
+    ans = PowerResidues(p, 3).to_list() if p > 1 else []
+    # 0 is only a cube of some 0 < a < p if a root of it is less than p
+    root = 1
+    for q, e in Counter(prime_factor(p) if p > 1 else []).items():
+        root *= q ** -(-e // 3)
+    if root >= p:
+        ans = [a for a in ans if a != 0]
+    if tracing.active():
+        tracing.emit("cubic.residues", p=p, residues=ans)
+    return ans
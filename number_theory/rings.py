@@ -0,0 +1,584 @@
+import math
+from . import euclid
+from .interning import interned_factory
+
+# Moduli up to this size share one object per residue
+INTERN_LIMIT = 1024
+
+
+@interned_factory()
+def ModularIntegers(n):
+    """Returns the integers modulo n"""
+    assert n > 0, "Must be modulo a positive integer"
+
+    interned = [None] * n if n <= INTERN_LIMIT else None
+
+    class Modular:
+        """A class representing arithmetic modulo n"""
+
+        __slots__ = ("a",)
+
+        def __new__(cls, a):
+            a %= n
+            if interned is not None:
+                value = interned[a]
+                if value is None:
+                    value = object.__new__(cls)
+                    value.a = a
+                    interned[a] = value
+                return value
+            value = object.__new__(cls)
+            value.a = a
+            return value
+
+        @classmethod
+        def __iter__(self):
+            def iterate():
+                for i in range(n):
+                    yield Modular(i)
+
+            return iterate()
+
+        def __radd__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            return Modular(self.a + other.a)
+
+        def __add__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            elif type(other) is ModVector:
+                return NotImplemented
+            return Modular(self.a + other.a)
+
+        def __rsub__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            return Modular(self.a - other.a)
+
+        def __sub__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            elif type(other) is ModVector:
+                return NotImplemented
+            return Modular(self.a - other.a)
+
+        def __neg__(self):
+            return Modular(n - self.a)
+
+        def __rmul__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            return Modular(self.a * other.a)
+
+        def __mul__(self, other):
+            if type(other) == int:
+                other = Modular(other)
+            elif type(other) is ModVector:
+                return NotImplemented
+            return Modular(self.a * other.a)
+
+        def __truediv__(self, other):
+            return self * other.multiplicative_inverse()
+
+        def __pow__(self, p):
+            return Modular(pow(self.a, p, n))
+
+        def __eq__(self, other):
+            if type(other) is int:
+                return self.a == other % n
+            try:
+                return self.a == other.a and n == other.get_modular_base()
+            except AttributeError:
+                return NotImplemented
+
+        def __hash__(self):
+            # Equal to the int self.a, so it must hash the same
+            return hash(self.a)
+
+        def to_nth_root_of_unity(self):
+            """Map to the nth root of unity by the projection homomorphism which maps 1 mod n to exp(2 pi i / n)"""
+            re = math.cos(2 * math.pi * self.a / n)
+            if abs(re) < 1e-12:
+                re = 0
+            im = math.sin(2 * math.pi * self.a / n)
+            if abs(im) < 1e-12:
+                im = 0
+            return complex(re, im)
+
+        @classmethod
+        def get_modular_base(cls):
+            """Get the modulus for this ring"""
+            return n
+
+        def multiplicative_inverse(self):
+            """Compute the multiplicative inverse, raising an error if this value is not a unit"""
+            if math.gcd(self.a, n) != 1:
+                raise ValueError(f"{self.a} does not have an inverse modulo {n}")
+            x, y = euclid.extended_euclidean(self.a, n)
+            if self.a * x + n * y == 1:
+                return Modular(x)
+            else:
+                return -Modular(x)
+
+        @classmethod
+        def natural_project_from(cls, value):
+            """Perform the natural projection into this additive group from the additive group the value is in"""
+            m = n // value.get_modular_base()
+            assert m * value.get_modular_base() == n, "Value is not from a subring"
+            return Modular(value.a * m)
+
+        def __str__(self):
+            return f"{self.a} mod {n}"
+
+        def __repr__(self):
+            return f"ModularIntegers({n})({self.a})"
+
+    class ModVector:
+        """A class representing a vector of values modulo n, with
+        elementwise arithmetic
+
+        Scalars (ints or values modulo n) are broadcast across the vector.
+        """
+
+        __slots__ = ("_values",)
+
+        def __init__(self, values, reduced=False):
+            """Make a vector from an iterable of ints or values modulo n
+
+            If reduced is True, the values are taken to already be ints in
+            range(n) and are used without being copied or reduced.
+            """
+            if reduced:
+                self._values = values
+            else:
+                self._values = [
+                    (v if type(v) is int else v.a) % n for v in values
+                ]
+
+        @classmethod
+        def _operand(cls, other):
+            """Get the other operand as either a list or a single int"""
+            if type(other) is int:
+                return other % n
+            elif type(other) is Modular:
+                return other.a
+            elif type(other) is ModVector:
+                return other._values
+            return None
+
+        def _zip_with(self, other, func):
+            other = ModVector._operand(other)
+            if other is None:
+                return NotImplemented
+            if type(other) is int:
+                return ModVector([func(a, other) for a in self._values], True)
+            if len(other) != len(self._values):
+                raise ValueError("Vectors must have the same length")
+            return ModVector(
+                [func(a, b) for (a, b) in zip(self._values, other)], True
+            )
+
+        # Elementwise arithmetic
+
+        def __add__(self, other):
+            return self._zip_with(other, lambda a, b: (a + b) % n)
+
+        __radd__ = __add__
+
+        def __sub__(self, other):
+            return self._zip_with(other, lambda a, b: (a - b) % n)
+
+        def __rsub__(self, other):
+            return self._zip_with(other, lambda a, b: (b - a) % n)
+
+        def __neg__(self):
+            return ModVector([-a % n for a in self._values], True)
+
+        def __mul__(self, other):
+            return self._zip_with(other, lambda a, b: a * b % n)
+
+        __rmul__ = __mul__
+
+        def __truediv__(self, other):
+            if type(other) is ModVector:
+                return self * other.multiplicative_inverse()
+            elif type(other) is int:
+                other = Modular(other)
+            return self * other.multiplicative_inverse()
+
+        def __pow__(self, p):
+            if type(p) is ModVector:
+                raise TypeError("Exponents must be integers, not values modulo n")
+            if type(p) is int:
+                return ModVector([pow(a, p, n) for a in self._values], True)
+            if len(p) != len(self._values):
+                raise ValueError("Vectors must have the same length")
+            return ModVector(
+                [pow(a, k, n) for (a, k) in zip(self._values, p)], True
+            )
+
+        def multiplicative_inverse(self):
+            """Compute the elementwise multiplicative inverse, raising an
+            error if any value is not a unit
+
+            Uses Montgomery's trick, so only one inversion is performed.
+            """
+            return ModVector(euclid.inverse_many(self._values, n), True)
+
+        def __eq__(self, other):
+            if type(other) is not ModVector:
+                return NotImplemented
+            return self._values == other._values
+
+        # Access to elements
+
+        def __len__(self):
+            return len(self._values)
+
+        def __getitem__(self, index):
+            if type(index) is slice:
+                return ModVector(self._values[index], True)
+            return Modular(self._values[index])
+
+        def __iter__(self):
+            return map(Modular, self._values)
+
+        def to_list(self):
+            """Get the values as a list of ints in range(n)"""
+            return list(self._values)
+
+        def sum(self):
+            """Sum all the values in the vector"""
+            return Modular(sum(self._values))
+
+        def product(self):
+            """Multiply all the values in the vector"""
+            acc = 1
+            for a in self._values:
+                acc = acc * a % n
+            return Modular(acc)
+
+        @classmethod
+        def range(cls, *args):
+            """Make the vector of the given range of integers"""
+            return cls(range(*args))
+
+        # Display control
+
+        def __str__(self):
+            return "[" + ", ".join(map(str, self._values)) + f"] mod {n}"
+
+        def __repr__(self):
+            return f"ModularIntegers({n}).Vector({self._values})"
+
+    Modular.Vector = ModVector
+
+    return Modular
+
+
+# Polynomials with fewer coefficients than this are multiplied term by
+# term; longer ones are packed into one large integer each (Kronecker
+# substitution), so the product is taken by CPython's own Karatsuba
+KRONECKER_LIMIT = 32
+# Divisors with at least this many coefficients are divided by with a
+# Newton inverse of their reversal rather than by long division
+NEWTON_DIVISION_LIMIT = 40
+
+
+def _unit_inverse(a, n):
+    if math.gcd(a, n) != 1:
+        raise ValueError(f"{a} does not have an inverse modulo {n}")
+    return pow(a, -1, n)
+
+
+def _trim(c):
+    while c and c[-1] == 0:
+        c.pop()
+    return c
+
+
+def _pack(c, width):
+    return int.from_bytes(b"".join(a.to_bytes(width, "little") for a in c), "little")
+
+
+def _multiply(a, b, n):
+    """Multiply lists of coefficients modulo n"""
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) < KRONECKER_LIMIT:
+        product = [0] * (len(a) + len(b) - 1)
+        for i, x in enumerate(a):
+            if x:
+                for j, y in enumerate(b):
+                    product[i + j] += x * y
+        return _trim([c % n for c in product])
+    # Every coefficient of the product is less than 2^(8 width)
+    width = (2 * (n - 1).bit_length() + min(len(a), len(b)).bit_length()) // 8 + 1
+    packed = _pack(a, width)
+    packed *= packed if a is b else _pack(b, width)
+    data = packed.to_bytes(width * (len(a) + len(b)), "little")
+    size = width * (len(a) + len(b) - 1)
+    return _trim(
+        [int.from_bytes(data[i : i + width], "little") % n for i in range(0, size, width)]
+    )
+
+
+def _inverse_series(f, k, n):
+    """Invert a power series with a unit constant term, modulo x^k and n, by
+    Newton's iteration g <- g (2 - fg), which doubles the precision each time"""
+    g = [_unit_inverse(f[0], n)]
+    m = 1
+    while m < k:
+        m = min(2 * m, k)
+        e = [-c % n for c in _multiply(f[:m], g, n)[:m]]
+        e += [0] * (1 - len(e))
+        e[0] = (e[0] + 2) % n
+        g = _multiply(g, e, n)[:m]
+    return g
+
+
+def _divmod(a, b, n, inverse=None):
+    """Divide lists of coefficients modulo n, by b with a unit leading
+    coefficient, optionally given the inverse of its reversal as a series"""
+    k = len(a) - len(b) + 1
+    if k <= 0:
+        return [], list(a)
+    if len(b) < NEWTON_DIVISION_LIMIT:
+        lead = _unit_inverse(b[-1], n)
+        r = list(a)
+        q = [0] * k
+        for i in range(k - 1, -1, -1):
+            c = r[i + len(b) - 1] * lead % n
+            q[i] = c
+            if c:
+                for j, y in enumerate(b):
+                    r[i + j] = (r[i + j] - c * y) % n
+        return _trim(q), _trim(r[: len(b) - 1])
+    if inverse is None or len(inverse) < k:
+        inverse = _inverse_series(b[::-1], k, n)
+    q = _multiply(a[::-1][:k], inverse[:k], n)[:k]
+    q = _trim((q + [0] * (k - len(q)))[::-1])
+    bq = _multiply(b, q, n)[: len(b) - 1]
+    bq += [0] * (len(b) - 1 - len(bq))
+    return q, _trim([(x - y) % n for x, y in zip(a, bq)])
+
+
+@interned_factory()
+def PolynomialRing(ring):
+    """Returns the polynomials over the integers modulo n, given the ring
+    made by `ModularIntegers(n)`"""
+    n = ring.get_modular_base()
+
+    class Polynomial:
+        """A class representing a polynomial with coefficients modulo n
+
+        The coefficients are kept as a list of ints in range(n), lowest
+        degree first, with no trailing zeros.
+        """
+
+        __slots__ = ("_coefficients",)
+
+        def __init__(self, coefficients=(), reduced=False):
+            """Make a polynomial from its coefficients (ints or values modulo
+            n), lowest degree first
+
+            If reduced is True, the coefficients are taken to already be a
+            list of ints in range(n), with no trailing zeros, and are used
+            without being copied or reduced.
+            """
+            if reduced:
+                self._coefficients = coefficients
+            else:
+                self._coefficients = _trim(
+                    [(c if type(c) is int else c.a) % n for c in coefficients]
+                )
+
+        @classmethod
+        def _operand(cls, other):
+            """Get the coefficients of the other operand, or None if it is
+            not a polynomial, int or value modulo n"""
+            if type(other) is Polynomial:
+                return other._coefficients
+            elif type(other) is int:
+                return _trim([other % n])
+            elif type(other) is ring:
+                return _trim([other.a])
+            return None
+
+        @classmethod
+        def get_base_ring(cls):
+            """Get the ring of the coefficients"""
+            return ring
+
+        @property
+        def degree(self):
+            """The degree of the polynomial, or -1 for zero"""
+            return len(self._coefficients) - 1
+
+        def leading_coefficient(self):
+            """Get the coefficient of the highest power of x"""
+            return ring(self._coefficients[-1] if self._coefficients else 0)
+
+        # Arithmetic
+
+        def __add__(self, other):
+            b = Polynomial._operand(other)
+            if b is None:
+                return NotImplemented
+            a = self._coefficients
+            if len(a) < len(b):
+                a, b = b, a
+            total = [(x + y) % n for x, y in zip(a, b)] + a[len(b) :]
+            return Polynomial(_trim(total), True)
+
+        __radd__ = __add__
+
+        def __neg__(self):
+            return Polynomial([-c % n for c in self._coefficients], True)
+
+        def __sub__(self, other):
+            b = Polynomial._operand(other)
+            if b is None:
+                return NotImplemented
+            return self + Polynomial([-c % n for c in b], True)
+
+        def __rsub__(self, other):
+            return -self + other
+
+        def __mul__(self, other):
+            b = Polynomial._operand(other)
+            if b is None:
+                return NotImplemented
+            return Polynomial(_multiply(self._coefficients, b, n), True)
+
+        __rmul__ = __mul__
+
+        def __pow__(self, e):
+            assert e >= 0, "Exponents must be non-negative"
+            result = [1] if n > 1 else []
+            base = self._coefficients
+            for bit in bin(e)[2:]:
+                result = _multiply(result, result, n)
+                if bit == "1":
+                    result = _multiply(result, base, n)
+            return Polynomial(result, True)
+
+        def __divmod__(self, other):
+            b = Polynomial._operand(other)
+            if b is None:
+                return NotImplemented
+            if not b:
+                raise ZeroDivisionError("Polynomial division by zero")
+            q, r = _divmod(self._coefficients, b, n)
+            return Polynomial(q, True), Polynomial(r, True)
+
+        def __floordiv__(self, other):
+            return divmod(self, other)[0]
+
+        def __mod__(self, other):
+            return divmod(self, other)[1]
+
+        def powmod(self, e, modulus):
+            """Compute self^e modulo another polynomial, such as x^p mod f, by
+            successive squaring
+
+            The inverse used for Newton division by the modulus is found
+            once and reused for every reduction.
+            """
+            assert e >= 0, "Exponents must be non-negative"
+            f = Polynomial._operand(modulus)
+            if not f:
+                raise ZeroDivisionError("Polynomial division by zero")
+            inverse = None
+            if len(f) >= NEWTON_DIVISION_LIMIT:
+                inverse = _inverse_series(f[::-1], len(f) - 1, n)
+
+            def reduce(a):
+                return _divmod(a, f, n, inverse)[1]
+
+            base = reduce(self._coefficients)
+            result = reduce(_trim([1 % n]))
+            for bit in bin(e)[2:]:
+                result = reduce(_multiply(result, result, n))
+                if bit == "1":
+                    if base == [0, 1]:
+                        # Multiplying by x is a shift
+                        result = reduce([0] + result if result else [])
+                    else:
+                        result = reduce(_multiply(result, base, n))
+            return Polynomial(result, True)
+
+        def monic(self):
+            """Divide by the leading coefficient"""
+            if not self._coefficients:
+                return self
+            lead = _unit_inverse(self._coefficients[-1], n)
+            return Polynomial([c * lead % n for c in self._coefficients], True)
+
+        def gcd(self, other):
+            """Find the monic greatest common divisor, for n prime"""
+            a, b = self, Polynomial(Polynomial._operand(other), True)
+            while b:
+                a, b = b, a % b
+            return a.monic()
+
+        def derivative(self):
+            """The formal derivative, with coefficients reduced modulo n"""
+            return Polynomial(
+                _trim([i * c % n for i, c in enumerate(self._coefficients)][1:]),
+                True,
+            )
+
+        def __call__(self, value):
+            """Evaluate at a value modulo n"""
+            x = value if type(value) is int else value.a
+            total = 0
+            for c in reversed(self._coefficients):
+                total = (total * x + c) % n
+            return ring(total)
+
+        def __bool__(self):
+            return bool(self._coefficients)
+
+        def __eq__(self, other):
+            b = Polynomial._operand(other)
+            if b is None:
+                return NotImplemented
+            return self._coefficients == b
+
+        def __hash__(self):
+            # Constants equal ints and residues, so hash the same as them
+            if len(self._coefficients) <= 1:
+                return hash(self._coefficients[0] if self._coefficients else 0)
+            return hash((n, tuple(self._coefficients)))
+
+        # Access to coefficients
+
+        def __getitem__(self, i):
+            """Get the coefficient of x^i"""
+            c = self._coefficients
+            return ring(c[i] if 0 <= i < len(c) else 0)
+
+        def to_list(self):
+            """Get the coefficients as a list of ints in range(n), lowest
+            degree first"""
+            return list(self._coefficients)
+
+        # Display control
+
+        def __str__(self):
+            terms = []
+            for i in range(len(self._coefficients) - 1, -1, -1):
+                c = self._coefficients[i]
+                if c == 0:
+                    continue
+                power = "" if i == 0 else "x" if i == 1 else f"x^{i}"
+                terms.append(power if c == 1 and i > 0 else f"{c}{power}")
+            return (" + ".join(terms) or "0") + f" mod {n}"
+
+        def __repr__(self):
+            return f"PolynomialRing(ModularIntegers({n}))({self._coefficients})"
+
+    Polynomial.x = Polynomial([0, 1])
+    return Polynomial
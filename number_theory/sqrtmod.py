@@ -0,0 +1,168 @@
+from collections import Counter
+from functools import lru_cache
+from math import isqrt
+
+from .euclid import crt_many
+from .prime import prime_factor, rabin_miller
+
+
+@lru_cache(maxsize=256)
+def quadratic_nonresidue(p):
+    """Find the least quadratic non-residue modulo an odd prime p"""
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    return z
+
+
+def two_adic_valuation(n):
+    """Return the largest k such that 2^k divides n != 0"""
+    return (n & -n).bit_length() - 1
+
+
+def sqrt_mod_prime(a, p):
+    """Find x such that x^2 = a (mod p) for a prime p, or None if a is not a
+    quadratic residue
+
+    Uses the closed forms for p = 3 (mod 4) and p = 5 (mod 8), and otherwise
+    Tonelli-Shanks, or Cipolla's algorithm if p-1 is divisible by a large
+    power of 2.
+    """
+    a %= p
+    if a == 0 or p == 2:
+        return a
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    if p % 8 == 5:
+        # Atkin's formula
+        v = pow(2 * a, (p - 5) // 8, p)
+        i = 2 * a * v * v % p
+        return a * v * (i - 1) % p
+    s = two_adic_valuation(p - 1)
+    # Tonelli-Shanks costs about s^2 / 4 multiplications on top of the
+    # exponentiations, against a few times log p for Cipolla
+    if s * s > 16 * p.bit_length():
+        return _cipolla(a, p)
+    return _tonelli_shanks(a, p, s)
+
+
+def _tonelli_shanks(a, p, s):
+    q = (p - 1) >> s
+    c = pow(quadratic_nonresidue(p), q, p)
+    x = pow(a, (q + 1) // 2, p)
+    t = pow(a, q, p)
+    m = s
+    while t != 1:
+        # Find the least i with t^(2^i) = 1
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        x = x * b % p
+        c = b * b % p
+        t = t * c % p
+        m = i
+    return x
+
+
+def _cipolla(a, p):
+    # Find t such that w = t^2 - a is not a square, and work in F_p(sqrt w)
+    t = 1
+    while pow((t * t - a) % p, (p - 1) // 2, p) != p - 1:
+        t += 1
+    w = (t * t - a) % p
+    # Compute (t + sqrt w)^((p+1)/2) by successive squaring
+    x, y = 1, 0
+    u, v = t, 1
+    k = (p + 1) // 2
+    while k > 0:
+        if k & 1:
+            x, y = (x * u + y * v * w) % p, (x * v + y * u) % p
+        u, v = (u * u + v * v * w) % p, 2 * u * v % p
+        k >>= 1
+    return x
+
+
+def sqrt_mod_prime_power(a, p, e):
+    """Find x such that x^2 = a (mod p^e) for a prime p, or None if there is
+    no such x, by Hensel lifting a square root modulo p"""
+    n = p ** e
+    a %= n
+    if a == 0:
+        return 0
+    # Pull out the largest even power of p dividing a
+    v = 0
+    while a % p == 0:
+        a //= p
+        v += 1
+    if v % 2 == 1:
+        return None
+    k = e - v
+    if p == 2:
+        if (k >= 2 and a % 4 != 1) or (k >= 3 and a % 8 != 1):
+            return None
+        x = 1
+        for i in range(3, k):
+            if (x * x - a) % (1 << (i + 1)) != 0:
+                x += 1 << (i - 1)
+    else:
+        x = sqrt_mod_prime(a, p)
+        if x is None:
+            return None
+        # Newton's method doubles the precision each step
+        precision = 1
+        while precision < k:
+            precision = min(2 * precision, k)
+            pk = p ** precision
+            x = (x - (x * x - a) * pow(2 * x, -1, pk)) % pk
+    return x * p ** (v // 2) % n
+
+
+def sqrt_mod(a, n, factors=None):
+    """Find x such that x^2 = a (mod n), or None if there is no such x
+
+    Composite n are factored (or the prime factors can be passed in) and
+    roots modulo each prime power are combined by the CRT.
+    """
+    assert n > 0, "Must be modulo a positive integer"
+    if n == 1:
+        return 0
+    if factors is None:
+        if n > 2 and n % 2 == 1 and rabin_miller(n, 40):
+            return sqrt_mod_prime(a, n)
+        factors = prime_factor(n)
+    residues, moduli = [], []
+    for p, e in Counter(factors).items():
+        x = sqrt_mod_prime_power(a, p, e)
+        if x is None:
+            return None
+        residues.append(x)
+        moduli.append(p ** e)
+    return crt_many(residues, moduli)
+
+
+def cornacchia(n, d=1, root=None):
+    """Find a primitive solution to x^2 + d y^2 = n, or None if there is not
+    one found from the square root of -d modulo n
+
+    The root can be passed in if it is already known.
+    """
+    if root is None:
+        root = sqrt_mod(-d, n)
+        if root is None:
+            return None
+    r0, r1 = n, root % n
+    if 2 * r1 < n:
+        r1 = n - r1
+    while r1 * r1 >= n:
+        r0, r1 = r1, r0 % r1
+    rest = n - r1 * r1
+    if rest % d != 0:
+        return None
+    y = isqrt(rest // d)
+    if y * y * d != rest:
+        return None
+    return r1, y
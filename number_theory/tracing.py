@@ -0,0 +1,91 @@
+import sys
+from contextlib import contextmanager
+
+# The sinks currently attached, each called as sink(event, fields)
+_sinks = []
+
+# How the LaTeX sink renders each event, as a format string or a function
+# of the fields, registered by the modules which emit them
+LATEX_TEMPLATES = {}
+
+
+def active():
+    """Returns true iff any sink is attached
+
+    Algorithms check this once, outside their loops, and only build events
+    when it is true, so untraced runs pay nothing for tracing.
+    """
+    return bool(_sinks)
+
+
+def emit(event, **fields):
+    """Send a step event to every attached sink"""
+    for sink in _sinks:
+        sink(event, fields)
+
+
+@contextmanager
+def attached(sink):
+    """Attach a sink for the duration of the block"""
+    _sinks.append(sink)
+    try:
+        yield sink
+    finally:
+        _sinks.remove(sink)
+
+
+def register_latex(templates):
+    """Register how the LaTeX sink renders some events"""
+    LATEX_TEMPLATES.update(templates)
+
+
+class EventList(list):
+    """A sink which keeps every (event, fields) pair, for inspecting runs"""
+
+    def __call__(self, event, fields):
+        self.append((event, fields))
+
+
+class LatexSink:
+    """A sink which renders events as LaTeX, buffering them until flushed
+    so that all the formatting and writing is done in one go"""
+
+    def __init__(self, stream=None, templates=LATEX_TEMPLATES):
+        self.stream = stream
+        self.templates = templates
+        self._events = []
+
+    def __call__(self, event, fields):
+        self._events.append((event, fields))
+
+    def render(self):
+        """Render the buffered events"""
+        parts = []
+        for event, fields in self._events:
+            template = self.templates[event]
+            if callable(template):
+                parts.append(template(**fields))
+            else:
+                parts.append(template.format(**fields))
+        return "".join(parts)
+
+    def flush(self):
+        """Write out the buffered events, to standard output by default"""
+        stream = self.stream or sys.stdout
+        stream.write(self.render())
+        self._events.clear()
+
+
+@contextmanager
+def latex_output(enabled=True, stream=None):
+    """Render the events of the block as LaTeX on stream (standard output by
+    default) if enabled, writing them all when the block ends"""
+    if not enabled:
+        yield None
+        return
+    sink = LatexSink(stream)
+    with attached(sink):
+        try:
+            yield sink
+        finally:
+            sink.flush()
@@ -1,13 +1,7 @@
-from math import gcd
+# This module now lives in the number_theory package. Importing it by its
+# old top-level name gives the package's module object itself
+import sys
 
+from number_theory import order
 
-def find_order(a, m):
-    """Compute the order of a mod m"""
-    if gcd(a, m) != 1:
-        return None
-    i = 1
-    power = a
-    while power != 1:
-        i += 1
-        power = (power * a) % m
-    return i
+sys.modules[__name__] = order
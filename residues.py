@@ -1,25 +1,7 @@
-def list_quadratic(n):
-    hit = set()
-    for a in range(n):
-        hit.add(pow(a, 2, n))
-    return sorted(hit)
+# This module now lives in the number_theory package. Importing it by its
+# old top-level name gives the package's module object itself
+import sys
 
+from number_theory import residues
 
-def list_cubic(p, display_output=True):
-    def output(*args, **kwargs):
-        if display_output:
-            print(*args, **kwargs)
-
-    hit = set()
-    output("\\begin{tabular}{ c|c }\n$a$ & $a^3$ \\\\\n\\hline")
-    for a in range(1, p):
-        hit.add(pow(a, 3, p))
-        output("{} & {} \\\\".format(a, pow(a, 3, p)))
-    output("\\end{tabular}")
-    ans = sorted(hit)
-    output(
-        "Thus, we observe the cubic residues modulo {} are {}".format(
-            p, ", ".join(map(str, ans))
-        )
-    )
-    return ans
+sys.modules[__name__] = residues